@@ -0,0 +1,255 @@
+"""페이지별 데이터 처리 경로 마이크로 벤치마크.
+
+각 페이지가 쓰는 함수(CSV 읽기, 날짜별 저장소 적재·갱신, 필터·정렬, 색상 계산,
+그래프·지도 생성)를 합성 데이터 1배 / 10배 / 100배 크기에서 실행하고, 실행
+시간(최소·중앙값)과 tracemalloc 기준 최대 메모리를 .cache/bench/results.jsonl 에
+한 줄씩 덧붙입니다. 커밋과 라이브러리 버전, 1배로 삼은 원본 파일도 함께 기록하므로
+실행끼리 비교할 수 있습니다.
+
+    python -m bench.run                           # 모든 경우, 1·10·100배
+    python -m bench.run --scales 1 10 --cases "fire.*" --repeat 5
+"""
+import argparse
+import fnmatch
+import itertools
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import time
+import tracemalloc
+import warnings
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bench.synthetic import BASELINES, GENERATORS
+from fire_data import aggregate_by_district, load_data
+from fire_maps import FAST_MARKER_THRESHOLD, create_district_map, create_fast_map, create_folium_map
+from gazetteer import locate_districts
+from mbti_charts import country_figure, type_figure
+from mbti_data import parse_mbti_csv
+from mbti_similarity import kmeans, nearest_neighbors
+from subway_analysis import station_totals
+from subway_charts import build_station_figure
+from subway_data import SubwayStore, aggregate_chunks, build_station_index, iter_csv_chunks
+
+RESULTS = Path(".cache") / "bench" / "results.jsonl"
+# 지하철 날짜별 저장소(SubwayStore) 경우가 쓰는 폴더 (경우를 준비할 때마다 비움)
+STORE_DIR = Path(".cache") / "bench" / "store"
+SCALES = [1, 10, 100]
+
+# 지도는 마커 수가 비용을 좌우하므로 1배 마커 수를 따로 둠 (페이지 기본값 기준)
+MAP_BASE_MARKERS = 100
+
+# name: "데이터.경로", prepare(path, scale) → 입력 (시간 측정 안 함), run(입력) → 측정 대상
+Case = namedtuple("Case", ["name", "dataset", "prepare", "run"])
+
+
+@lru_cache(maxsize=1)
+def _subway_frame(path):
+    return aggregate_chunks(iter_csv_chunks([path]))
+
+
+def _busiest_day(path):
+    """하루 · 한 호선의 역별 승하차 표 (날짜·호선별 보기 탭과 같은 입력)."""
+    index = build_station_index(_subway_frame(path))
+    return max(index.values(), key=len)
+
+
+def _empty_dir(name):
+    root = STORE_DIR / name
+    shutil.rmtree(root, ignore_errors=True)
+    root.mkdir(parents=True)
+    return root
+
+
+class _ColdStore:
+    """빈 저장소에 원본 CSV 전체를 적재 (새 레플리카의 첫 load_store와 같음)."""
+
+    def __init__(self, path):
+        self.path = path
+        root = _empty_dir("cold")
+        # 실행마다 새 빈 폴더를 써서 폴더를 지우는 시간은 재지 않음
+        self._roots = (root / str(i) for i in itertools.count())
+
+    def run(self):
+        return SubwayStore(next(self._roots)).refresh([self.path])
+
+
+class _WarmStore:
+    """이미 적재한 저장소에 원본 끝에 덧붙은 행을 반영 (페이지를 다시 열 때마다의 refresh)."""
+
+    def __init__(self, path):
+        root = _empty_dir("warm")
+        # 원본을 복사해서 덧붙이므로 다른 경우가 쓰는 합성 CSV는 그대로
+        self.source = root / "source.csv"
+        shutil.copyfile(path, self.source)
+        self.store = SubwayStore(root / "store")
+        self.store.refresh([self.source])
+        # 마지막 날짜의 (호선, 역) 구성을 하루치 행 틀로 씀: 날짜 자리만 바꿔 덧붙임
+        last = self.store.dates()[-1]
+        day = self.store.day(last).assign(사용일자="{date}")
+        self.template = day.to_csv(header=False, index=False).encode("cp949")
+        self.date = pd.Timestamp(str(last))
+
+    def run(self):
+        return self.store.refresh([self.source])
+
+    def append_day(self):
+        self.date += pd.Timedelta(days=1)
+        with open(self.source, "ab") as f:
+            f.write(self.template.replace(b"{date}", self.date.strftime("%Y%m%d").encode()))
+        return self.run()
+
+
+@lru_cache(maxsize=1)
+def _mbti_bytes(path):
+    return Path(path).read_bytes()
+
+
+@lru_cache(maxsize=1)
+def _fire_frame(path):
+    return load_data(path, top_n=None)
+
+
+@lru_cache(maxsize=1)
+def _fire_geo(path):
+    df = _fire_frame(path).copy()
+    df[["Latitude", "Longitude"]] = locate_districts(df)
+    return df.dropna(subset=["Latitude", "Longitude"])
+
+
+def _district_geo(path):
+    df = aggregate_by_district(_fire_frame(path))
+    df[["Latitude", "Longitude"]] = locate_districts(df)
+    return df.dropna(subset=["Latitude", "Longitude"])
+
+
+def _render(m):
+    """st_folium과 같이 지도 HTML을 만들어야 실제 비용이 잡힘."""
+    return m.get_root().render()
+
+
+CASES = [
+    Case("subway.load", "subway", lambda path, scale: [path],
+         lambda paths: aggregate_chunks(iter_csv_chunks(paths))),
+    Case("subway.store_cold", "subway", lambda path, scale: _ColdStore(path), lambda job: job.run()),
+    Case("subway.store_noop", "subway", lambda path, scale: _WarmStore(path), lambda job: job.run()),
+    Case("subway.store_append", "subway", lambda path, scale: _WarmStore(path), lambda job: job.append_day()),
+    Case("subway.station_index", "subway", lambda path, scale: _subway_frame(path), build_station_index),
+    Case("subway.station_totals", "subway", lambda path, scale: _subway_frame(path),
+         lambda df: station_totals(df, day_type="평일", top_n=15)),
+    Case("subway.figure", "subway", lambda path, scale: _busiest_day(path),
+         lambda frame: build_station_figure(frame, "", 15).to_json()),
+
+    Case("mbti.parse", "mbti", lambda path, scale: _mbti_bytes(path), parse_mbti_csv),
+    Case("mbti.type_figure", "mbti", lambda path, scale: parse_mbti_csv(_mbti_bytes(path)),
+         lambda matrix: type_figure(matrix, "INFJ").to_json()),
+    Case("mbti.country_figure", "mbti", lambda path, scale: parse_mbti_csv(_mbti_bytes(path)),
+         lambda matrix: country_figure(matrix, matrix.countries[0]).to_json()),
+    Case("mbti.neighbors", "mbti", lambda path, scale: parse_mbti_csv(_mbti_bytes(path)).values,
+         lambda values: nearest_neighbors(values, "cosine", k=10)),
+    Case("mbti.kmeans", "mbti", lambda path, scale: parse_mbti_csv(_mbti_bytes(path)).values,
+         lambda values: kmeans(values, 5)),
+
+    Case("fire.load", "fire", lambda path, scale: path, lambda path: load_data(path, top_n=None)),
+    Case("fire.load_top_k", "fire", lambda path, scale: path, lambda path: load_data(path, top_n=MAP_BASE_MARKERS)),
+    Case("fire.aggregate", "fire", lambda path, scale: _fire_frame(path), aggregate_by_district),
+    Case("fire.locate", "fire", lambda path, scale: _fire_frame(path), locate_districts),
+    Case("fire.folium_map", "fire", lambda path, scale: _fire_geo(path).head(MAP_BASE_MARKERS * scale),
+         lambda df: _render(create_folium_map(df))),
+    Case("fire.fast_map", "fire", lambda path, scale: _fire_geo(path).head(FAST_MARKER_THRESHOLD * scale),
+         lambda df: _render(create_fast_map(df))),
+    Case("fire.district_map", "fire", lambda path, scale: _district_geo(path),
+         lambda df: _render(create_district_map(df))),
+]
+
+
+def measure(run, arg, repeat):
+    """(실행 시간 목록, 최대 메모리 바이트).
+
+    메모리는 먼저 한 번 따로 실행해서 재고, 이 실행이 첫 호출 비용(지연 import,
+    lru_cache 채우기)을 치르므로 시간은 그 다음 실행들만 잽니다.
+    """
+    tracemalloc.start()
+    try:
+        run(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(arg)
+        times.append(time.perf_counter() - started)
+    return times, peak
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+    }
+
+
+def select_cases(patterns):
+    if not patterns:
+        return CASES
+    return [case for case in CASES if any(fnmatch.fnmatch(case.name, p) for p in patterns)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", nargs="+", type=int, default=SCALES)
+    parser.add_argument("--cases", nargs="+", help='실행할 경우 이름 (glob, 예: "subway.*")')
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--label", help="결과 구분용 이름 (예: 변경 전/후)")
+    parser.add_argument("--output", type=Path, default=RESULTS)
+    args = parser.parse_args(argv)
+
+    cases = select_cases(args.cases)
+    # folium 타일 안내 경고가 결과 출력 사이에 섞이지 않도록
+    warnings.filterwarnings("ignore", category=UserWarning, module="folium")
+    env = dict(environment(), label=args.label, run_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "a", encoding="utf-8") as out:
+        for scale in args.scales:
+            for case in cases:
+                path = GENERATORS[case.dataset](scale)
+                arg = case.prepare(str(path), scale)
+                times, peak = measure(case.run, arg, args.repeat)
+                result = dict(
+                    env,
+                    case=case.name,
+                    scale=scale,
+                    baseline=BASELINES[case.dataset],
+                    input_rows=len(arg) if hasattr(arg, "__len__") and not isinstance(arg, (str, bytes, list)) else None,
+                    repeat=args.repeat,
+                    min_s=round(min(times), 6),
+                    median_s=round(statistics.median(times), 6),
+                    peak_mib=round(peak / 2 ** 20, 3),
+                )
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+                print(f"x{scale:<4} {case.name:<24} {result['median_s']:>9.4f}s {result['peak_mib']:>9.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""페이지별 첫 화면까지 걸리는 시간(time-to-first-render) 측정.
+
+페이지마다 새 파이썬 프로세스를 띄워서 (import가 하나도 안 된 상태)
+streamlit.testing의 AppTest로 스크립트를 한 번 실행하고 시간을 잽니다.
+
+- cold: 새 레플리카에 첫 방문자가 바로 그 페이지를 연 경우
+- warm: core.warm_up()으로 무거운 라이브러리를 미리 불러 둔 뒤 연 경우
+
+결과는 한 줄에 하나씩 JSON으로 .cache/bench/startup.jsonl 에 덧붙입니다.
+
+    python -m bench.startup                 # 모든 페이지, cold + warm
+    python -m bench.startup pages/03_MBTI분석.py --repeat 3
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+RESULTS = Path(".cache") / "bench" / "startup.jsonl"
+MODES = ["cold", "warm"]
+
+
+def default_pages():
+    return [Path("maim.py")] + sorted(Path("pages").glob("*.py"))
+
+
+def measure(page, mode):
+    """현재 프로세스에서 page를 한 번 실행한 결과 (자식 프로세스에서 호출)."""
+    started = time.perf_counter()
+    warm_up_seconds = 0.0
+    if mode == "warm":
+        from core import warm_up
+        warm_up()
+        warm_up_seconds = time.perf_counter() - started
+
+    from streamlit.testing.v1 import AppTest
+
+    render_started = time.perf_counter()
+    app = AppTest.from_file(str(Path(page).resolve()), default_timeout=600).run()
+    finished = time.perf_counter()
+    return {
+        "page": str(page),
+        "mode": mode,
+        "first_render_s": round(finished - render_started, 4),
+        "warm_up_s": round(warm_up_seconds, 4),
+        "process_total_s": round(finished - started, 4),
+        "error": str(app.exception[0].message) if app.exception else None,
+    }
+
+
+def run_child(page, mode):
+    """새 프로세스에서 measure를 실행하고 결과를 받아옵니다."""
+    completed = subprocess.run(
+        [sys.executable, "-m", "bench.startup", "--child", str(page), "--mode", mode],
+        capture_output=True, text=True, check=False,
+    )
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        return {"page": str(page), "mode": mode, "error": completed.stderr.strip()[-500:]}
+    return json.loads(lines[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", type=Path, help="측정할 페이지 (기본: maim.py + pages/*.py)")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--output", type=Path, default=RESULTS)
+    parser.add_argument("--child", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--mode", choices=MODES, default="cold", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.mode), ensure_ascii=False))
+        return
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    run_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+    with open(args.output, "a", encoding="utf-8") as out:
+        for page in args.pages or default_pages():
+            for mode in args.modes:
+                for _ in range(args.repeat):
+                    result = dict(run_child(page, mode), run_at=run_at)
+                    out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    status = "error" if result.get("error") else f"{result['first_render_s']:.2f}s"
+                    print(f"{mode:>4}  {status:>8}  {page}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""벤치마크용 합성 데이터 생성기.
+
+저장소에 있는 실제 파일 크기를 1배로 보고 scale배 크기의 CSV를 만듭니다.
+
+- 지하철: bongsuuun.csv (한 달치)를 scale번 복사해 한 달(31일)씩 과거로 옮기고
+  승·하차 인원을 ±20% 흔듭니다. 역·호선 구성은 실제와 같습니다.
+- MBTI: countriesMBTI_16types.csv 의 국가를 scale번 복사해 '국가 #2' 같은 이름을
+  붙이고 비율을 조금 흔든 뒤 다시 합이 1이 되도록 맞춥니다.
+- 화재: 저장소에 원본이 없으므로 연간 화재 건수(약 4만 건)를 1배로 보고,
+  data/korea_districts.csv 의 시·군·구에 무작위로 흩뿌립니다.
+
+만든 파일은 .cache/bench/data 에 두고 다음 실행 때 다시 씁니다.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from fire_data import FIRE_CSV
+from gazetteer import GAZETTEER_CSV
+from mbti_data import DEFAULT_CSV as MBTI_CSV
+from subway_data import SOURCE_CSV as SUBWAY_CSV
+
+DATA_DIR = Path(".cache") / "bench" / "data"
+
+# 화재 통계 1배 크기 (연간 화재 건수 수준)
+FIRE_BASE_ROWS = 40_000
+
+FIRE_CAUSES = ["전기적요인", "부주의", "기계적요인", "화학적요인", "방화", "미상"]
+FIRE_CAUSE_DETAILS = ["단락", "과부하", "담배꽁초", "음식물 조리중", "과열", "불꽃, 불티"]
+FIRE_MATERIALS = ["종이", "쓰레기", "전선피복", "식용유", "목재", "합성수지"]
+
+
+def _output(name, scale):
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    return DATA_DIR / f"{name}-x{scale}.csv"
+
+
+def subway_csv(scale, seed=0):
+    """bongsuuun.csv 의 scale배 크기 지하철 승하차 CSV 경로 (cp949)."""
+    path = _output("subway", scale)
+    if path.exists():
+        return path
+    rng = np.random.default_rng(seed)
+    base = pd.read_csv(SUBWAY_CSV, encoding="cp949")
+    dates = pd.to_datetime(base["사용일자"].astype(str), format="%Y%m%d")
+    frames = []
+    for copy in range(scale):
+        frame = base.copy()
+        shifted = dates - pd.Timedelta(days=31 * copy)
+        frame["사용일자"] = shifted.dt.strftime("%Y%m%d").astype(int)
+        for col in ["승차총승객수", "하차총승객수"]:
+            frame[col] = np.round(frame[col] * rng.uniform(0.8, 1.2, len(frame))).astype(int)
+        frames.append(frame)
+    pd.concat(frames, ignore_index=True).to_csv(path, index=False, encoding="cp949")
+    return path
+
+
+def mbti_csv(scale, seed=0):
+    """countriesMBTI_16types.csv 의 scale배 행 수 MBTI 비율 CSV 경로."""
+    path = _output("mbti", scale)
+    if path.exists():
+        return path
+    rng = np.random.default_rng(seed)
+    base = pd.read_csv(MBTI_CSV)
+    types = [col for col in base.columns if col != "Country"]
+    frames = []
+    for copy in range(scale):
+        frame = base.copy()
+        if copy:
+            frame["Country"] = frame["Country"] + f" #{copy + 1}"
+            noisy = frame[types].to_numpy() * rng.uniform(0.85, 1.15, (len(frame), len(types)))
+            frame[types] = noisy / noisy.sum(axis=1, keepdims=True)
+        frames.append(frame)
+    pd.concat(frames, ignore_index=True).to_csv(path, index=False)
+    return path
+
+
+def fire_csv(scale, seed=0):
+    """연간 화재 건수의 scale배 크기 화재 통계 CSV 경로 (원본과 같은 열 이름)."""
+    path = _output("fire", scale)
+    if path.exists():
+        return path
+    rng = np.random.default_rng(seed)
+    districts = pd.read_csv(GAZETTEER_CSV, keep_default_na=False)
+    n = FIRE_BASE_ROWS * scale
+    pick = rng.integers(0, len(districts), n)
+    district = districts["시_군_구"].to_numpy()[pick]
+    pd.DataFrame({
+        "화재발생년원일": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 366, n), unit="D"),
+        "시도": districts["시도"].to_numpy()[pick],
+        "시_군_구": np.where(district == "", None, district),
+        "화재유형": "건축,구조물",
+        "발화열원대분류": "작동기기",
+        "발화열원소분류": "전기적 아크",
+        "발화요인대분류": rng.choice(FIRE_CAUSES, n),
+        "발화요인소분류": rng.choice(FIRE_CAUSE_DETAILS, n),
+        "최초착화물대분류": "종이",
+        "최초착화물소분류": rng.choice(FIRE_MATERIALS, n),
+        "인명피해(명)소계": 0,
+        "사망": 0,
+        "부상": 0,
+        "재산피해소계": rng.lognormal(12, 2, n).astype(np.int64),
+    }).to_csv(path, index=False, encoding="utf-8")
+    return path
+
+
+GENERATORS = {"subway": subway_csv, "mbti": mbti_csv, "fire": fire_csv}
+
+# 각 데이터의 1배 기준 (bench.run이 결과 줄마다 baseline으로 기록)
+BASELINES = {"subway": SUBWAY_CSV, "mbti": MBTI_CSV, "fire": f"{FIRE_CSV} (약 {FIRE_BASE_ROWS:,}건 가정)"}
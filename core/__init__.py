@@ -0,0 +1,8 @@
+"""여러 페이지가 같이 쓰는 공통 모듈 (지연 import, 워밍업).
+
+numpy가 필요한 모듈(core.colors, core.geo)은 여기서 다시 내보내지 않습니다.
+maim.py가 `import core`를 할 때 numpy를 메인 스레드에서 불러오지 않고 워밍업
+스레드에 맡기기 위해서이며, 쓰는 곳에서 core.colors처럼 직접 import합니다.
+"""
+from core.lazy import LazyModule, lazy_import
+from core.warmup import HEAVY_MODULES, WarmUp, start_warm_up, warm_up
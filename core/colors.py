@@ -0,0 +1,32 @@
+"""matplotlib 없이 두 색 사이 그라데이션을 만드는 함수."""
+import numpy as np
+
+# matplotlib LinearSegmentedColormap 기본값과 같은 단계 수
+LEVELS = 256
+
+
+def _hex_to_rgb(color):
+    color = color.lstrip("#")
+    return np.array([int(color[i:i + 2], 16) for i in (0, 2, 4)], dtype=np.float64)
+
+
+def lerp_hex(values, start="#FFFF00", end="#FF0000"):
+    """값을 최소/최대로 정규화해 start → end 색으로 선형 보간한 hex 색상 배열.
+
+    값이 모두 같으면 end 색, NaN은 start 색입니다. LEVELS 단계로 나눠서
+    matplotlib colormap (from_list 기본 256단계)과 같은 색이 나옵니다.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    min_value, max_value = (np.nanmin(values), np.nanmax(values)) if finite.any() else (0.0, 0.0)
+    if max_value > min_value:
+        normalized = (values - min_value) / (max_value - min_value)
+    else:
+        normalized = np.ones_like(values)
+    normalized[~finite] = 0.0
+    level = np.clip((normalized * LEVELS).astype(np.int64), 0, LEVELS - 1)
+    t = (level / (LEVELS - 1))[:, None]
+
+    low, high = _hex_to_rgb(start) / 255, _hex_to_rgb(end) / 255
+    rgb = np.round((low + (high - low) * t) * 255).astype(np.int64)
+    return np.char.mod("#%06x", (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2])
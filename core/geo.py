@@ -0,0 +1,100 @@
+"""여러 페이지가 같이 쓰는 위치 계산: 하버사인 거리, 격자 근접 색인, 지하철역 좌표.
+
+data/seoul_stations.csv 는 역 위치(역사 중심 기준의 대략적인 좌표)이며 역명은
+bongsuuun.csv 표기를 따릅니다.
+"""
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+STATIONS_CSV = Path("data") / "seoul_stations.csv"
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_matrix(a, b=None):
+    """(위도, 경도) 배열 a, b 사이의 거리 행렬 (km, len(a) × len(b))."""
+    a = np.radians(np.asarray(a, dtype=np.float64).reshape(-1, 2))
+    b = a if b is None else np.radians(np.asarray(b, dtype=np.float64).reshape(-1, 2))
+    dlat = b[None, :, 0] - a[:, None, 0]
+    dlon = b[None, :, 1] - a[:, None, 1]
+    h = np.sin(dlat / 2) ** 2 + np.cos(a[:, None, 0]) * np.cos(b[None, :, 0]) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+class GridIndex:
+    """위도/경도 점을 일정한 크기(km)의 격자 칸으로 나눈 근접 검색 색인."""
+
+    def __init__(self, coords, cell_km=0.5):
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        self.cell_km = cell_km
+        # 서울 정도 범위에서는 등장방형 투영으로 충분
+        lat0 = np.radians(self.coords[:, 0].mean()) if len(self.coords) else 0.0
+        self._km_per_deg = np.array([111.32, 111.32 * np.cos(lat0)])
+        cells = self.cell_of(self.coords)
+        self._cells = {}
+        if len(cells):
+            keys, inverse = np.unique(cells, axis=0, return_inverse=True)
+            order = np.argsort(inverse.reshape(-1), kind="stable")
+            bounds = np.cumsum(np.bincount(inverse.reshape(-1)))[:-1]
+            for key, members in zip(map(tuple, keys), np.split(order, bounds)):
+                self._cells[key] = members
+            self._lo, self._hi = keys.min(axis=0), keys.max(axis=0)
+
+    def cell_of(self, coords):
+        """(위도, 경도) 배열 → 격자 칸 번호 배열."""
+        return np.floor(coords * self._km_per_deg / self.cell_km).astype(np.int64)
+
+    def cell_center(self, cells):
+        """격자 칸 번호 배열 → 칸 중심 (위도, 경도) 배열."""
+        return (cells + 0.5) * self.cell_km / self._km_per_deg
+
+    def _ring(self, center, r):
+        """center 칸에서 체비쇼프 거리가 정확히 r인 칸들의 점 번호."""
+        cx, cy = center
+        found = []
+        for dx in range(-r, r + 1):
+            for dy in (range(-r, r + 1) if abs(dx) == r else (-r, r) if r else (0,)):
+                members = self._cells.get((cx + dx, cy + dy))
+                if members is not None:
+                    found.append(members)
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def nearest(self, lat, lon, k=1):
+        """(lat, lon)에서 가까운 k개 점의 (번호 배열, 거리 km 배열)."""
+        if not self._cells:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        k = min(k, len(self.coords))
+        center = tuple(self.cell_of(np.array([[lat, lon]]))[0])
+        max_ring = int(max(np.abs(self._lo - center).max(), np.abs(self._hi - center).max()))
+        found = np.empty(0, dtype=np.int64)
+        for r in range(max_ring + 1):
+            found = np.concatenate([found, self._ring(center, r)])
+            if len(found) < k:
+                continue
+            dist = haversine_matrix([[lat, lon]], self.coords[found])[0]
+            # r칸 밖의 점은 적어도 r × cell_km 떨어져 있으므로 k번째가 그 안이면 끝
+            if np.partition(dist, k - 1)[k - 1] <= r * self.cell_km:
+                break
+        dist = haversine_matrix([[lat, lon]], self.coords[found])[0]
+        order = np.argsort(dist, kind="stable")[:k]
+        return found[order], dist[order]
+
+    def within(self, lat, lon, radius_km):
+        """(lat, lon)에서 radius_km 안에 있는 점 번호 (가까운 순)."""
+        if not self._cells:
+            return np.empty(0, dtype=np.int64)
+        center = tuple(self.cell_of(np.array([[lat, lon]]))[0])
+        rings = int(np.ceil(radius_km / self.cell_km))
+        found = np.concatenate([self._ring(center, r) for r in range(rings + 1)])
+        dist = haversine_matrix([[lat, lon]], self.coords[found])[0]
+        keep = dist <= radius_km
+        return found[keep][np.argsort(dist[keep], kind="stable")]
+
+
+@lru_cache(maxsize=None)
+def load_stations(path=STATIONS_CSV):
+    """역명, 호선, 위도, 경도 표 (같은 역이 여러 호선이면 호선마다 한 줄)."""
+    return pd.read_csv(path, dtype={"역명": str, "호선": str})
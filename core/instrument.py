@@ -0,0 +1,225 @@
+"""페이지가 느릴 때 어디서 시간이 드는지 보는 가벼운 계측 도구.
+
+환경 변수 APP_DEBUG=1 이나 주소 뒤 ?debug=1 로 켭니다. 켜져 있으면 한 번의
+재실행(rerun) 동안
+
+- stage("이름") 블록마다 걸린 시간과 횟수,
+- tracked(st.cache_data)로 감싼 함수의 호출 수와 실제 실행 수(= 캐시 미스),
+- 프로세스 메모리(RSS)
+
+를 모아서 debug_panel()이 사이드바에 보여 주고, 한 줄짜리 JSON으로
+.cache/debug/runs.jsonl 에 덧붙입니다. 꺼져 있으면 기록할 곳이 없어서
+stage와 tracked는 거의 아무 일도 하지 않습니다.
+
+Streamlit은 재실행마다 새 스레드에서 스크립트를 돌리므로 기록은 스레드별로
+따로 둡니다 (fragment만 다시 실행될 때는 기록하지 않음).
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import ContextDecorator
+from pathlib import Path
+
+from core.lazy import lazy_import
+
+st = lazy_import("streamlit")
+
+DEBUG_ENV = "APP_DEBUG"
+DEBUG_PARAM = "debug"
+DEBUG_LOG = Path(".cache") / "debug" / "runs.jsonl"
+
+# 세션마다 보관하는 최근 재실행 기록 수
+HISTORY_SIZE = 100
+
+_local = threading.local()
+
+
+class RunRecorder:
+    """한 번의 재실행 동안 모은 단계별 시간, 카운터, 캐시 적중 수."""
+
+    def __init__(self, page):
+        self.page = page
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.stages = {}    # 이름 → [누적 초, 횟수]
+        self.counters = {}  # 이름 → 값
+        self.cache = {}     # 함수 이름 → [호출 수, 실제 실행 수]
+        self.total = None
+
+    def add_stage(self, name, seconds):
+        entry = self.stages.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def finish(self):
+        if self.total is None:
+            self.total = time.perf_counter() - self.started
+        return self
+
+    def to_record(self):
+        rss, peak = memory_usage()
+        return {
+            "page": self.page,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+            "total_s": round(self.total if self.total is not None else time.perf_counter() - self.started, 6),
+            "stages": {name: {"s": round(s, 6), "n": n} for name, (s, n) in self.stages.items()},
+            "counters": dict(self.counters),
+            "cache": {name: {"calls": calls, "misses": misses} for name, (calls, misses) in self.cache.items()},
+            "rss_mib": rss,
+            "peak_rss_mib": peak,
+        }
+
+
+def current():
+    """지금 스레드의 기록기 (계측이 꺼져 있으면 None)."""
+    return getattr(_local, "recorder", None)
+
+
+def debug_requested():
+    """환경 변수나 ?debug= 쿼리 파라미터로 계측을 켰는지."""
+    if os.environ.get(DEBUG_ENV, "").lower() in ("1", "true", "yes"):
+        return True
+    try:
+        return st.query_params.get(DEBUG_PARAM, "").lower() in ("1", "true", "yes")
+    except Exception:  # Streamlit 밖(벤치마크, 스크립트)에서 불린 경우
+        return False
+
+
+def start_run(page):
+    """페이지 맨 위에서 호출: 계측이 켜져 있으면 새 기록기를 시작해 돌려줍니다."""
+    _local.recorder = RunRecorder(page) if debug_requested() else None
+    return _local.recorder
+
+
+class stage(ContextDecorator):
+    """with stage("CSV 읽기"): ... 또는 @stage("지도 생성") 으로 걸린 시간을 기록."""
+
+    def __init__(self, name):
+        self.name = name
+        self._started = None
+
+    def _recreate_cm(self):
+        # 데코레이터로 쓸 때 호출마다 새 객체 (스레드·재귀 호출에서 시작 시각이 섞이지 않도록)
+        return type(self)(self.name)
+
+    def __enter__(self):
+        self._started = time.perf_counter() if current() is not None else None
+        return self
+
+    def __exit__(self, *exc):
+        recorder = current()
+        if recorder is not None and self._started is not None:
+            recorder.add_stage(self.name, time.perf_counter() - self._started)
+        return False
+
+
+def count(name, n=1):
+    """카운터를 n만큼 올립니다 (예: 그린 마커 수)."""
+    recorder = current()
+    if recorder is not None:
+        recorder.counters[name] = recorder.counters.get(name, 0) + n
+
+
+def tracked(cache, name=None):
+    """st.cache_data / st.cache_resource 대신 쓰는 데코레이터: 캐시 적중률을 셉니다.
+
+    바깥 함수는 호출 수를, 캐시 안쪽 함수는 실제로 실행된 수(미스)를 세므로
+    적중 수 = 호출 수 - 미스 입니다. 캐시 키는 원래 함수 기준으로 만들어집니다.
+
+        @tracked(st.cache_data)
+        def load_data(path): ...
+    """
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def inner(*args, **kwargs):
+            recorder = current()
+            if recorder is not None:
+                recorder.cache.setdefault(label, [0, 0])[1] += 1
+            with stage(label):
+                return func(*args, **kwargs)
+
+        cached = cache(inner)
+
+        @functools.wraps(func)
+        def outer(*args, **kwargs):
+            recorder = current()
+            if recorder is not None:
+                recorder.cache.setdefault(label, [0, 0])[0] += 1
+            return cached(*args, **kwargs)
+
+        outer.clear = cached.clear
+        return outer
+
+    return decorate
+
+
+def memory_usage():
+    """(현재 RSS MiB, 최대 RSS MiB). 알 수 없으면 None."""
+    rss = peak = None
+    try:
+        with open("/proc/self/statm") as f:
+            rss = round(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20, 1)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # 리눅스는 KiB 단위
+        peak = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    except (ImportError, OSError):
+        pass
+    return rss, peak
+
+
+def _append_log(record):
+    try:
+        DEBUG_LOG.parent.mkdir(parents=True, exist_ok=True)
+        with open(DEBUG_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError:
+        pass
+
+
+def debug_panel():
+    """페이지 맨 끝에서 호출: 계측이 켜져 있을 때만 사이드바에 이번 재실행 기록을 보여 줍니다."""
+    recorder = current()
+    if recorder is None:
+        return
+    record = recorder.finish().to_record()
+    _append_log(record)
+    history = st.session_state.setdefault("_debug_runs", [])
+    history.append(record)
+    del history[:-HISTORY_SIZE]
+
+    with st.sidebar.expander("🛠️ 디버그: 재실행 계측", expanded=True):
+        st.caption(f"{record['page']} · 전체 {record['total_s'] * 1000:,.1f} ms · "
+                   f"RSS {record['rss_mib']} MiB (최대 {record['peak_rss_mib']} MiB)")
+        if record["stages"]:
+            st.dataframe(
+                [{"단계": name, "ms": round(v["s"] * 1000, 2), "횟수": v["n"]}
+                 for name, v in sorted(record["stages"].items(), key=lambda item: -item[1]["s"])],
+                hide_index=True, use_container_width=True,
+            )
+        if record["cache"]:
+            totals = {}
+            for run in history:
+                for func, v in run["cache"].items():
+                    calls, misses = totals.get(func, (0, 0))
+                    totals[func] = (calls + v["calls"], misses + v["misses"])
+            st.dataframe(
+                [{"캐시 함수": func, "호출": v["calls"], "미스": v["misses"],
+                  "세션 적중률": f"{1 - totals[func][1] / totals[func][0]:.0%}" if totals[func][0] else "-"}
+                 for func, v in record["cache"].items()],
+                hide_index=True, use_container_width=True,
+            )
+        if record["counters"]:
+            st.json(record["counters"], expanded=False)
+        st.download_button(
+            "JSON lines 내보내기",
+            "\n".join(json.dumps(run, ensure_ascii=False) for run in history) + "\n",
+            file_name="debug-runs.jsonl",
+            mime="application/jsonl",
+        )
@@ -0,0 +1,53 @@
+"""처음 쓸 때 불러오는 모듈.
+
+folium, geopy, plotly.express 같은 라이브러리는 import에만 0.2 ~ 0.7초가
+걸립니다. 페이지 맨 위에서 lazy_import로 받아 두면 실제로 속성을 쓰는
+순간(지도를 그리거나 지오코딩할 때)에 한 번만 불러옵니다.
+"""
+import importlib
+import sys
+import threading
+
+
+class LazyModule:
+    """속성에 처음 접근할 때 importlib.import_module(name)을 호출하는 대리 객체."""
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with self.__dict__["_lock"]:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = importlib.import_module(self.__dict__["_name"])
+                    self.__dict__["_module"] = module
+        return module
+
+    @property
+    def loaded(self):
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self.__dict__['_name']!r} ({state})>"
+
+
+def lazy_import(name):
+    """이미 불러온 모듈이면 그대로, 아니면 LazyModule을 돌려줍니다 (점 이름도 가능)."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
@@ -0,0 +1,67 @@
+"""서버 프로세스가 뜬 직후 무거운 라이브러리를 미리 불러 두는 워밍업.
+
+Streamlit은 페이지를 처음 열 때 그 페이지의 import를 실행하므로, 새 레플리카의
+첫 방문자는 pandas · plotly · folium · geopy를 불러오는 시간을 그대로 기다립니다.
+maim.py가 처음 실행될 때 백그라운드 스레드에서 이 모듈들을 import해 두면
+(sys.modules는 프로세스 전체가 공유) 다른 페이지는 이미 불러온 모듈을 씁니다.
+"""
+import importlib
+import threading
+import time
+
+# 여러 페이지가 쓰는 무거운 모듈 (import 시간이 긴 순서 대략)
+HEAVY_MODULES = (
+    "numpy",
+    "pandas",
+    "plotly.graph_objects",
+    "plotly.express",
+    "folium",
+    "folium.plugins",
+    "streamlit_folium",
+    "geopy.geocoders",
+    "geopy.extra.rate_limiter",
+    "pyarrow.parquet",
+)
+
+
+def warm_up(modules=HEAVY_MODULES):
+    """modules를 차례로 import하고 {모듈: 걸린 초} 를 돌려줍니다 (없는 모듈은 None)."""
+    timings = {}
+    for name in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            timings[name] = None
+            continue
+        timings[name] = time.perf_counter() - started
+    return timings
+
+
+class WarmUp:
+    """백그라운드 워밍업 스레드와 그 결과."""
+
+    def __init__(self, modules=HEAVY_MODULES):
+        self.modules = tuple(modules)
+        self.timings = {}
+        self._thread = threading.Thread(target=self._run, name="core-warm-up", daemon=True)
+
+    def _run(self):
+        self.timings = warm_up(self.modules)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    @property
+    def done(self):
+        return not self._thread.is_alive()
+
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+        return self.done
+
+
+def start_warm_up(modules=HEAVY_MODULES):
+    """워밍업을 데몬 스레드로 시작합니다 (첫 화면은 기다리지 않음)."""
+    return WarmUp(modules).start()
@@ -0,0 +1,92 @@
+"""소방청 연간화재통계 CSV를 읽고 시·군·구별로 집계하는 함수 모음.
+
+페이지가 쓰는 열만 골라 청크 단위로 읽고, 재산피해 상위 k건만 계속 남기므로
+여러 해치 파일도 메모리는 청크 하나와 k건 정도만 씁니다. 돌려주는 표의 문자열
+열은 pyarrow 문자열이라 파이썬 문자열 객체보다 훨씬 작습니다.
+"""
+import pandas as pd
+
+FIRE_CSV = "소방청_연간화재통계_20241231.csv"
+
+# 지도·표·집계에 쓰는 열 ('인명피해(명)소계', '사망', '부상' 등은 읽지 않음)
+TEXT_COLUMNS = ['시도', '시_군_구', '발화요인대분류', '발화요인소분류', '최초착화물소분류']
+DAMAGE_COLUMN = '재산피해소계'
+# 파싱은 파이썬 문자열이 더 빠르므로 읽은 뒤 청크마다 compact()로 바꿉니다.
+FIRE_DTYPES = {**{col: str for col in TEXT_COLUMNS}, DAMAGE_COLUMN: 'float64'}
+COMPACT_DTYPES = {col: 'string[pyarrow]' for col in TEXT_COLUMNS}
+
+CHUNK_SIZE = 200_000
+
+
+def iter_chunks(file_path=FIRE_CSV, chunksize=CHUNK_SIZE):
+    """필요한 열만 청크 단위로 읽습니다."""
+    with pd.read_csv(
+        file_path,
+        encoding='utf-8',
+        usecols=list(FIRE_DTYPES),
+        dtype=FIRE_DTYPES,
+        chunksize=chunksize,
+    ) as reader:
+        yield from reader
+
+
+def top_k(chunks, k, column=DAMAGE_COLUMN):
+    """청크를 차례로 받으며 column 값이 가장 큰 k행만 남깁니다 (값이 같으면 먼저 나온 행).
+
+    청크마다 nlargest로 후보를 고른 뒤 지금까지의 상위 k행과 합쳐 다시 k행만
+    남기므로, 전체를 정렬하지 않고 메모리도 청크 하나 + k행으로 유지됩니다.
+    """
+    best = None
+    for chunk in chunks:
+        candidates = chunk.nlargest(k, column)
+        best = candidates if best is None else pd.concat([best, candidates]).nlargest(k, column)
+    return best
+
+
+def compact(df):
+    """문자열 열을 pyarrow 문자열로 바꿉니다."""
+    return df.astype(COMPACT_DTYPES)
+
+
+def load_data(file_path=FIRE_CSV, top_n=100, chunksize=CHUNK_SIZE):
+    """CSV 파일을 로드하고 초기 데이터 처리를 수행합니다.
+
+    재산피해소계가 큰 순서로 정렬된 상위 top_n건을 돌려주며, top_n=None이면 전체입니다.
+    """
+    chunks = iter_chunks(file_path, chunksize)
+    if top_n is None:
+        # 지오코딩은 오프라인 행정구역 사전으로 처리하므로 전체 데이터도 표시할 수 있습니다.
+        df = pd.concat([compact(chunk) for chunk in chunks], ignore_index=True)
+        df = df.sort_values(by=DAMAGE_COLUMN, ascending=False, kind='stable')
+    else:
+        df = top_k(chunks, top_n)
+        if df is None:
+            df = pd.read_csv(file_path, encoding='utf-8', usecols=list(FIRE_DTYPES), dtype=FIRE_DTYPES)
+        df = compact(df)
+    df = df.reset_index(drop=True)
+    # NaN은 '미상'으로 처리하여 문자열 결합에 문제가 없도록 합니다.
+    df['시_군_구'] = df['시_군_구'].fillna('미상')
+    # 지오코딩을 위한 주소 컬럼 생성
+    df['full_address'] = df['시도'] + ' ' + df['시_군_구']
+    return df
+
+
+def aggregate_by_district(df):
+    """전체 화재 데이터를 시·군·구별로 집계합니다 (건수, 피해 합계/평균, 주요 발화요인)."""
+    keys = ['시도', '시_군_구']
+    df_district = df.groupby(keys, sort=False).agg(
+        화재건수=('재산피해소계', 'size'),
+        재산피해합계=('재산피해소계', 'sum'),
+        재산피해평균=('재산피해소계', 'mean'),
+    ).reset_index()
+
+    # 시·군·구마다 가장 많이 나온 발화요인대분류
+    cause_counts = df.groupby(keys + ['발화요인대분류'], sort=False).size().reset_index(name='건수')
+    dominant = (
+        cause_counts.sort_values('건수', ascending=False, kind='stable')
+        .drop_duplicates(subset=keys)
+        .rename(columns={'발화요인대분류': '주요발화요인', '건수': '주요발화요인건수'})
+    )
+    df_district = df_district.merge(dominant, on=keys, how='left')
+    df_district['full_address'] = df_district['시도'] + ' ' + df_district['시_군_구']
+    return df_district.sort_values('재산피해합계', ascending=False).reset_index(drop=True)
@@ -0,0 +1,150 @@
+"""화재 통계 Folium 지도를 만드는 함수 모음 (개별 화재 / 빠른 렌더링 / 시·군·구 집계)."""
+import numpy as np
+import pandas as pd
+
+from core import lazy_import
+from core.colors import lerp_hex
+
+# 지도는 버튼을 누른 뒤에만 필요하므로 처음 쓸 때 불러옵니다.
+folium = lazy_import("folium")
+folium_plugins = lazy_import("folium.plugins")
+
+# 지도 중심 (대한민국 중앙 부근)
+MAP_CENTER = [35.907757, 127.766922]
+
+# 재산피해 규모에 따른 색상 스케일 (예: 노랑 -> 빨강)
+DAMAGE_COLORS = ("#FFFF00", "#FF0000")
+
+
+def damage_colors(values):
+    """값을 최소/최대로 정규화해 노랑 → 빨강 hex 색상 배열을 한 번에 만듭니다."""
+    return lerp_hex(values, *DAMAGE_COLORS)
+
+
+def incident_damage(df_geo):
+    """화재 한 건마다의 재산피해액 (값이 비어 있으면 0원으로 봄)."""
+    return df_geo['재산피해소계'].fillna(0)
+
+
+def incident_marker_style(df_geo):
+    """화재 한 건마다의 마커 반지름과 색상 배열."""
+    damage = incident_damage(df_geo).to_numpy(dtype=float)
+
+    # 재산피해에 비례하는 반지름 계산 (시각적 효과를 위해 제곱근 스케일 및 상수 곱 적용)
+    # 1000만원 = 1, 10억원 = 1000
+    radius_scale = 0.00001
+    radii = np.sqrt(damage * radius_scale) + 5  # 기본 크기 5 추가
+
+    # 피해액에 따른 색상 결정 (정규화 후 색상 매핑, 전체 열을 한 번에 계산)
+    return radii, damage_colors(damage)
+
+
+def create_folium_map(df_geo):
+    """Folium 지도를 생성하고 마커를 추가합니다."""
+    # Folium 지도 객체 생성
+    m = folium.Map(location=MAP_CENTER, zoom_start=7, tiles="cartodbdarkmatter")
+
+    # MarkerCluster 플러그인 사용 (마커가 겹칠 때 그룹화)
+    marker_cluster = folium_plugins.MarkerCluster().add_to(m)
+
+    radii, colors = incident_marker_style(df_geo)
+
+    # 팝업 정보 (열 단위로 문자열 결합)
+    popups = (
+        "<b>장소:</b> " + df_geo['full_address'].astype(str)
+        + "<br><b>피해액:</b> " + incident_damage(df_geo).map('{:,.0f}'.format) + " 원"
+        + "<br><b>발화요인:</b> " + df_geo['발화요인대분류'].astype(str) + " / " + df_geo['발화요인소분류'].astype(str)
+        + "<br><b>최초착화물:</b> " + df_geo['최초착화물소분류'].astype(str)
+    )
+
+    # CircleMarker (원형 마커) 추가
+    for lat, lon, radius, color_hex, popup_html in zip(
+        df_geo['Latitude'], df_geo['Longitude'], radii, colors, popups
+    ):
+        folium.CircleMarker(
+            location=(lat, lon),
+            radius=radius,
+            color=color_hex,
+            fill=True,
+            fill_color=color_hex,
+            fill_opacity=0.7,
+            popup=popup_html
+        ).add_to(marker_cluster)
+
+    return m
+
+
+# 이 건수를 넘으면 마커를 파이썬 객체 대신 하나의 배열 + JS 콜백으로 그립니다.
+FAST_MARKER_THRESHOLD = 1000
+
+# FastMarkerCluster 행: [위도, 경도, 반지름, 색상, 장소, 피해액, 발화요인대/소분류, 최초착화물]
+FAST_MARKER_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+        radius: row[2], color: row[3], fillColor: row[3], fillOpacity: 0.7
+    });
+    marker.bindPopup(
+        "<b>장소:</b> " + row[4] +
+        "<br><b>피해액:</b> " + row[5].toLocaleString("ko-KR") + " 원" +
+        "<br><b>발화요인:</b> " + row[6] + " / " + row[7] +
+        "<br><b>최초착화물:</b> " + row[8]
+    );
+    return marker;
+}
+"""
+
+
+def create_fast_map(df_geo):
+    """화재 건수가 많을 때 쓰는 지도: 마커 데이터를 배열 하나로 보내고 브라우저에서 그립니다."""
+    m = folium.Map(location=MAP_CENTER, zoom_start=7, tiles="cartodbdarkmatter")
+
+    radii, colors = incident_marker_style(df_geo)
+    data = pd.DataFrame({
+        'lat': df_geo['Latitude'].round(5).to_numpy(),
+        'lon': df_geo['Longitude'].round(5).to_numpy(),
+        'radius': radii.round(1),
+        'color': colors,
+        'address': df_geo['full_address'].astype(str).to_numpy(),
+        'damage': incident_damage(df_geo).round().astype('int64').to_numpy(),
+        'cause': df_geo['발화요인대분류'].astype(str).to_numpy(),
+        'cause_detail': df_geo['발화요인소분류'].astype(str).to_numpy(),
+        'material': df_geo['최초착화물소분류'].astype(str).to_numpy(),
+    }).values.tolist()
+
+    folium_plugins.FastMarkerCluster(data, callback=FAST_MARKER_CALLBACK).add_to(m)
+    return m
+
+
+def create_district_map(df_district):
+    """시·군·구마다 마커 하나로 전체 화재 통계를 표시합니다."""
+    m = folium.Map(location=MAP_CENTER, zoom_start=7, tiles="cartodbdarkmatter")
+
+    # 마커 크기는 화재 건수, 색상은 재산피해 합계에 비례 (노랑 -> 빨강)
+    counts = df_district['화재건수'].to_numpy(dtype=float)
+    radii = 4 + 26 * np.sqrt(counts / counts.max())
+    colors = damage_colors(df_district['재산피해합계'])
+
+    popups = (
+        "<b>지역:</b> " + df_district['full_address']
+        + "<br><b>화재 건수:</b> " + df_district['화재건수'].map('{:,}'.format) + " 건"
+        + "<br><b>재산피해 합계:</b> " + df_district['재산피해합계'].map('{:,.0f}'.format) + " 원"
+        + "<br><b>건당 평균 피해:</b> " + df_district['재산피해평균'].map('{:,.0f}'.format) + " 원"
+        + "<br><b>주요 발화요인:</b> " + df_district['주요발화요인'].astype(str)
+        + " (" + df_district['주요발화요인건수'].map('{:,}'.format) + " 건)"
+    )
+
+    for lat, lon, radius, color_hex, popup_html, address in zip(
+        df_district['Latitude'], df_district['Longitude'], radii, colors, popups, df_district['full_address']
+    ):
+        folium.CircleMarker(
+            location=(lat, lon),
+            radius=radius,
+            color=color_hex,
+            fill=True,
+            fill_color=color_hex,
+            fill_opacity=0.6,
+            popup=folium.Popup(popup_html, max_width=300),
+            tooltip=address,
+        ).add_to(m)
+
+    return m
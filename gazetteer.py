@@ -0,0 +1,118 @@
+"""시도 + 시_군_구 이름을 위도/경도로 바꾸는 오프라인 행정구역 사전(gazetteer).
+
+data/korea_districts.csv 에 전국 시·군·구(시청·군청·구청 소재지 기준의 대략적인
+좌표)와 시도 중심 좌표가 들어 있습니다. 이름 표기가 조금 달라도 찾을 수 있도록
+시도 약칭(서울, 경기 ...)과 옛 이름(강원도, 전라북도 ...)을 정규화하고,
+'수원시 장안구'처럼 구까지 있는 이름이 사전에 없으면 상위 시로 다시 찾습니다.
+"""
+import time
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+GAZETTEER_CSV = Path("data") / "korea_districts.csv"
+
+SIDO_ALIASES = {
+    "서울": "서울특별시", "서울시": "서울특별시",
+    "부산": "부산광역시", "부산시": "부산광역시",
+    "대구": "대구광역시", "대구시": "대구광역시",
+    "인천": "인천광역시", "인천시": "인천광역시",
+    "광주": "광주광역시", "광주시": "광주광역시",
+    "대전": "대전광역시", "대전시": "대전광역시",
+    "울산": "울산광역시", "울산시": "울산광역시",
+    "세종": "세종특별자치시", "세종시": "세종특별자치시",
+    "경기": "경기도",
+    "강원": "강원특별자치도", "강원도": "강원특별자치도",
+    "충북": "충청북도", "충남": "충청남도",
+    "전북": "전북특별자치도", "전라북도": "전북특별자치도",
+    "전남": "전라남도",
+    "경북": "경상북도", "경남": "경상남도",
+    "제주": "제주특별자치도", "제주도": "제주특별자치도",
+}
+
+# 이름이 바뀐 시·군·구 (시도, 옛 이름) → 새 이름
+DISTRICT_ALIASES = {
+    ("인천광역시", "남구"): "미추홀구",
+}
+
+# 시도 중심 좌표로 대신할 시_군_구 값
+UNKNOWN_DISTRICTS = ["미상", "기타", "nan"]
+
+# '수원시장안구' → '수원시' (공백 제거 후)
+CITY_WITH_GU = r"^(.+?시)(.+구)$"
+
+
+def normalize_sido(names):
+    """시도 이름을 사전 표기로 맞춥니다."""
+    return names.fillna("").astype(str).str.strip().replace(SIDO_ALIASES)
+
+
+def normalize_district(names):
+    """시_군_구 이름의 공백을 없애고, 알 수 없는 값은 빈 문자열로 바꿉니다."""
+    names = names.fillna("").astype(str).str.replace(r"\s+", "", regex=True)
+    return names.where(~names.isin(UNKNOWN_DISTRICTS), "")
+
+
+@lru_cache(maxsize=None)
+def load_gazetteer(path=GAZETTEER_CSV):
+    """(시도, 시_군_구) 정규화 키 → (위도, 경도) 표."""
+    table = pd.read_csv(path, dtype={"시도": str, "시_군_구": str}, keep_default_na=False)
+    table.index = pd.MultiIndex.from_arrays(
+        [normalize_sido(table["시도"]), normalize_district(table["시_군_구"])],
+        names=["sido_key", "district_key"],
+    )
+    return table[["위도", "경도"]]
+
+
+def locate_districts(df, sido_col="시도", district_col="시_군_구"):
+    """df의 각 행에 대한 Latitude, Longitude 표 (사전에 없는 행은 NaN).
+
+    고유한 (시도, 시_군_구) 조합만 사전과 맞춰 본 뒤 merge로 원래 행에 붙이므로
+    행 수가 많아도 조회 비용은 행정구역 수에 비례합니다.
+    """
+    table = load_gazetteer()
+    pairs = df[[sido_col, district_col]].drop_duplicates().reset_index(drop=True)
+    sido = normalize_sido(pairs[sido_col])
+    district = normalize_district(pairs[district_col])
+    district = pd.Series(
+        [DISTRICT_ALIASES.get(key, key[1]) for key in zip(sido, district)], dtype=object
+    )
+
+    found = table.reindex(pd.MultiIndex.from_arrays([sido, district])).to_numpy()
+    # 구까지 있는 이름이 사전에 없으면 상위 시 좌표를 사용
+    parent = district.str.replace(CITY_WITH_GU, r"\1", regex=True)
+    retry = table.reindex(pd.MultiIndex.from_arrays([sido, parent])).to_numpy()
+    missing = pd.isna(found[:, 0])
+    found[missing] = retry[missing]
+
+    pairs["Latitude"] = found[:, 0].astype(float)
+    pairs["Longitude"] = found[:, 1].astype(float)
+    merged = df[[sido_col, district_col]].merge(pairs, how="left", on=[sido_col, district_col])
+    merged.index = df.index
+    return merged[["Latitude", "Longitude"]]
+
+
+# geopy Location처럼 latitude, longitude 속성을 가진 결과
+Point = namedtuple("Point", ["latitude", "longitude"])
+
+
+class GazetteerGeocoder:
+    """'시도 시_군_구' 주소를 행정구역 사전에서 찾는 오프라인 지오코더.
+
+    geopy의 geocode 함수 대신 끼워 쓸 수 있어서, 네트워크 없이 백그라운드
+    지오코딩 흐름을 시험할 때 사용합니다. delay를 주면 조회마다 그만큼 기다립니다.
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def __call__(self, address):
+        if self.delay:
+            time.sleep(self.delay)
+        sido, _, district = str(address).strip().partition(" ")
+        coords = locate_districts(pd.DataFrame({"시도": [sido], "시_군_구": [district]})).iloc[0]
+        if pd.isna(coords["Latitude"]):
+            return None
+        return Point(coords["Latitude"], coords["Longitude"])
@@ -0,0 +1,212 @@
+"""주소 → (위도, 경도) 지오코딩 결과를 SQLite 파일에 저장하는 캐시.
+
+여러 프로세스와 앱 재시작 사이에도 결과를 공유하므로, 한 번 찾은 주소는
+다시 지오코딩 API를 호출하지 않습니다. 찾지 못한 주소도 (None, None)으로
+기록해 두어 같은 주소를 반복해서 조회하지 않습니다. 결과는 지오코더별로
+따로 저장하므로 시험용 스텁이 못 찾은 주소가 실제 지오코더 조회를 막지 않습니다.
+
+GeocodeJob은 주소 목록을 백그라운드 스레드에서 지오코딩해서, 화면을 막지 않고
+진행률과 중간 결과를 확인하거나 작업을 취소할 수 있게 해 줍니다. GeocodeJobs는
+재실행 사이에 작업을 보관하고, 사용자가 다시 시작할 때만 새 작업을 띄웁니다.
+"""
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+CACHE_DB = Path(".cache") / "geocode.sqlite3"
+
+# 앱이 실제로 쓰는 지오코더의 캐시 이름
+DEFAULT_GEOCODER = "nominatim"
+
+# 찾지 못한 주소를 나타내는 값
+NOT_FOUND = (None, None)
+
+
+class GeocodeCache:
+    """(지오코더, address) → (latitude, longitude) 를 저장하는 SQLite 캐시."""
+
+    def __init__(self, path=CACHE_DB, geocoder=DEFAULT_GEOCODER):
+        self.path = Path(path)
+        self.geocoder = geocoder
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode_results ("
+                " geocoder TEXT,"
+                " address TEXT,"
+                " latitude REAL,"
+                " longitude REAL,"
+                " updated_at REAL,"
+                " PRIMARY KEY (geocoder, address))"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_many(self, addresses):
+        """캐시에 있는 주소만 골라 {주소: (위도, 경도)} 로 돌려줍니다."""
+        addresses = list(addresses)
+        found = {}
+        with self._connect() as conn:
+            # SQLite 변수 개수 제한을 넘지 않도록 나눠서 조회
+            for i in range(0, len(addresses), 500):
+                batch = addresses[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT address, latitude, longitude FROM geocode_results"
+                    f" WHERE geocoder = ? AND address IN ({','.join('?' * len(batch))})",
+                    [self.geocoder] + batch,
+                )
+                for address, lat, lon in rows:
+                    found[address] = (lat, lon)
+        return found
+
+    def put_many(self, results):
+        """{주소: (위도, 경도)} 를 저장합니다 (이미 있으면 덮어씀)."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO geocode_results VALUES (?, ?, ?, ?, ?)",
+                [(self.geocoder, address, lat, lon, now) for address, (lat, lon) in results.items()],
+            )
+
+
+class MemoryCache:
+    """프로세스 안에서만 쓰는 GeocodeCache 대용 (시험용 지오코더 등)."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, addresses):
+        with self._lock:
+            return {address: self._data[address] for address in addresses if address in self._data}
+
+    def put_many(self, results):
+        with self._lock:
+            self._data.update(results)
+
+
+class GeocodeJob:
+    """주소 목록을 백그라운드 스레드에서 지오코딩하는 작업.
+
+    geocode는 주소를 받아 geopy Location(또는 None)을 돌려주는 함수이며, 호출 간격
+    제한은 geocode 쪽(예: geopy RateLimiter)에서 지킵니다. 결과는 한 건씩 cache에
+    저장되므로 작업이 취소되거나 앱이 재시작되어도 찾은 주소는 남습니다.
+    cache를 주지 않으면 이 프로세스 안의 MemoryCache를 씁니다. 네트워크 오류나
+    캐시 쓰기 오류(SQLite 잠금 시간 초과 등) 등 예외가 난 주소는 failed에 모으고
+    캐시에 남기지 않아 다음 작업에서 다시 조회합니다. 스레드는 오류로 멈추지 않으므로
+    처리한 주소 수가 전체보다 적으면 취소된 것입니다.
+    """
+
+    def __init__(self, addresses, geocode, cache=None):
+        self.addresses = list(dict.fromkeys(addresses))
+        self.geocode = geocode
+        self.cache = MemoryCache() if cache is None else cache
+        self.failed = []
+        self._results = {}
+        self._finished = 0
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    @property
+    def incomplete(self):
+        """끝났지만 취소되었거나 오류 난 주소가 있어 다시 돌릴 필요가 있는지."""
+        return not self.running and (self.finished < self.total or bool(self.failed))
+
+    @property
+    def total(self):
+        return len(self.addresses)
+
+    @property
+    def finished(self):
+        """처리가 끝난 주소 수 (캐시에서 찾은 것 포함)."""
+        with self._lock:
+            return self._finished
+
+    @property
+    def progress(self):
+        return self.finished / self.total if self.total else 1.0
+
+    def results(self):
+        """지금까지 찾은 {주소: (위도, 경도)} 의 복사본."""
+        with self._lock:
+            return dict(self._results)
+
+    def _record(self, address, coords):
+        with self._lock:
+            if coords is not None:
+                self._results[address] = coords
+            self._finished += 1
+
+    def _run(self):
+        try:
+            cached = self.cache.get_many(self.addresses)
+        except Exception:
+            # 캐시를 못 읽으면 모든 주소를 새로 조회
+            cached = {}
+        for address, coords in cached.items():
+            self._record(address, coords)
+
+        for address in self.addresses:
+            if self._cancel.is_set():
+                break
+            if address in cached:
+                continue
+            try:
+                location = self.geocode(address)
+                coords = (location.latitude, location.longitude) if location else NOT_FOUND
+                self.cache.put_many({address: coords})
+            except Exception:
+                self.failed.append(address)
+                self._record(address, None)
+                continue
+            self._record(address, coords)
+
+
+class GeocodeJobs:
+    """재실행 사이에 유지되는 지오코딩 작업 목록 {key: GeocodeJob}.
+
+    같은 key의 작업은 끝났거나 취소되었어도 그대로 돌려주고, restart=True일 때
+    (사용자가 다시 시작했을 때)만 취소되었거나 오류 난 주소가 있는 작업을 새로
+    띄웁니다. 새 작업은 캐시에 있는 주소는 건너뛰므로 남은 주소만 조회합니다.
+    """
+
+    def __init__(self, keep=4):
+        self.keep = keep
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def start(self, key, make_job, restart=False):
+        """key의 작업을 돌려주고, 없거나 restart로 다시 돌려야 하면 make_job()으로 시작합니다."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not (restart and job.incomplete):
+                return job
+            # 끝난 작업은 최근 것만 남기고 정리
+            done = [k for k, j in self._jobs.items() if k != key and not j.running]
+            for old_key in done[:max(0, len(done) - self.keep)]:
+                del self._jobs[old_key]
+            job = self._jobs[key] = make_job().start()
+            return job
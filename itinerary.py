@@ -0,0 +1,131 @@
+"""관광지 좌표로 하루 일정 순서를 짜는 여행 일정 엔진.
+
+- 모든 관광지 쌍의 거리를 하버사인 공식으로 한 번에 (n × n 행렬) 계산해 둡니다.
+- core.geo.GridIndex로 좌표를 약 0.5km 격자 칸에 나눠 담아서, 가장 가까운
+  관광지나 지하철역을 주변 칸만 보고 찾습니다.
+- 일정은 출발지(숙소)에서 시작해 가장 가까운 곳부터 하루 시간 안에 들를 수
+  있는 만큼 고르고(nearest neighbour), 2-opt로 순서를 다듬은 뒤 다음 날로
+  넘어갑니다. 관광지가 수백 곳이어도 1초 안에 끝납니다.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from core.geo import STATIONS_CSV, GridIndex, haversine_matrix, load_stations
+
+# 이동 시간 모델: 가까우면 걷고, 멀면 대중교통 (대기·환승 시간 포함)
+WALK_KMH = 4.5
+TRANSIT_KMH = 22.0
+TRANSIT_OVERHEAD_MIN = 10.0
+
+# 관광지마다 머무는 시간이 없을 때 쓰는 기본값 (분)
+DEFAULT_STAY_MIN = 90
+
+
+def travel_minutes(distance_km):
+    """거리(km)를 이동 시간(분)으로: 걷기와 대중교통 중 빠른 쪽."""
+    distance_km = np.asarray(distance_km, dtype=np.float64)
+    walk = distance_km / WALK_KMH * 60
+    transit = TRANSIT_OVERHEAD_MIN + distance_km / TRANSIT_KMH * 60
+    return np.where(distance_km > 0, np.minimum(walk, transit), 0.0)
+
+
+@lru_cache(maxsize=None)
+def station_index(path=STATIONS_CSV):
+    """역 위치 근접 검색 색인과 (역명, 호선) 표."""
+    stations = load_stations(path)
+    return GridIndex(stations[["위도", "경도"]].to_numpy()), stations
+
+
+# 하루 일정: stops = 관광지 번호(방문 순서), arrive/depart = 출발 후 경과 분,
+# legs = 각 관광지까지 이동 시간(분), back = 마지막 관광지 → 출발지 이동 시간
+DayPlan = namedtuple("DayPlan", ["stops", "arrive", "depart", "legs", "back", "total"])
+
+
+def _route_length(route, cost):
+    return cost[route[:-1], route[1:]].sum()
+
+
+def two_opt(route, cost):
+    """양 끝(출발지)을 고정하고 구간 뒤집기로 경로를 줄입니다 (가장 큰 개선부터)."""
+    route = np.asarray(route)
+    if len(route) < 5:
+        # 경유지 2곳 이하는 뒤집어도 대칭 비용이면 같음
+        return route
+    while True:
+        a, b = route[:-1], route[1:]
+        # delta[i, j]: 간선 (a_i, b_i), (a_j, b_j)를 (a_i, a_j), (b_i, b_j)로 바꿀 때 변화량
+        delta = cost[a[:, None], a[None, :]] + cost[b[:, None], b[None, :]] - cost[a, b][:, None] - cost[a, b][None, :]
+        delta = np.triu(delta, k=2)
+        i, j = np.unravel_index(np.argmin(delta), delta.shape)
+        if delta[i, j] >= -1e-9:
+            return route
+        route = np.concatenate([route[:i + 1], route[i + 1:j + 1][::-1], route[j + 1:]])
+
+
+class ItineraryPlanner:
+    """관광지 좌표와 머무는 시간으로 여러 날 일정을 짭니다."""
+
+    def __init__(self, coords, stay_minutes=None):
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        n = len(self.coords)
+        self.stay = (
+            np.full(n, DEFAULT_STAY_MIN, dtype=np.float64) if stay_minutes is None
+            else np.asarray(stay_minutes, dtype=np.float64)
+        )
+        self.distance = haversine_matrix(self.coords)
+        self.travel = travel_minutes(self.distance)
+        self.index = GridIndex(self.coords)
+
+    def nearest_place(self, lat, lon, k=1):
+        return self.index.nearest(lat, lon, k)
+
+    def _with_start(self, start):
+        """관광지 + 출발지(마지막 번호) 이동 시간 행렬."""
+        n = len(self.coords)
+        from_start = travel_minutes(haversine_matrix([start], self.coords)[0])
+        cost = np.zeros((n + 1, n + 1))
+        cost[:n, :n] = self.travel
+        cost[n, :n] = cost[:n, n] = from_start
+        return cost
+
+    def _schedule(self, route, cost):
+        """출발지 → 관광지들 → 출발지 경로의 도착/출발 시각."""
+        stops = route[1:-1]
+        legs = cost[route[:-2], stops]
+        arrive = np.cumsum(legs + np.concatenate([[0.0], self.stay[stops][:-1]]))
+        depart = arrive + self.stay[stops]
+        back = cost[stops[-1], route[-1]]
+        return DayPlan(stops, arrive, depart, legs, back, depart[-1] + back)
+
+    def plan(self, days, day_minutes, start, include=None):
+        """days일 일정 [DayPlan, ...]과 시간이 모자라 빠진 관광지 번호 배열.
+
+        start는 매일 출발하고 돌아오는 (위도, 경도), day_minutes는 하루 시간 예산,
+        include를 주면 그 관광지만 대상으로 합니다.
+        """
+        n = len(self.coords)
+        cost = self._with_start(start)
+        home = n
+        remaining = np.zeros(n, dtype=bool)
+        remaining[np.arange(n) if include is None else np.asarray(include, dtype=np.int64)] = True
+
+        plans = []
+        for _ in range(days):
+            route, elapsed, current = [home], 0.0, home
+            while True:
+                # 이 관광지를 들렀다가 출발지로 돌아와도 예산 안인지
+                finish = elapsed + cost[current, :n] + self.stay + cost[:n, home]
+                feasible = remaining & (finish <= day_minutes)
+                if not feasible.any():
+                    break
+                nxt = int(np.argmin(np.where(feasible, cost[current, :n], np.inf)))
+                elapsed += cost[current, nxt] + self.stay[nxt]
+                remaining[nxt] = False
+                route.append(nxt)
+                current = nxt
+            if len(route) == 1:
+                break
+            plans.append(self._schedule(two_opt(route + [home], cost), cost))
+        return plans, np.flatnonzero(remaining)
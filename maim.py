@@ -1,4 +1,15 @@
 import streamlit as st
+
+from core import start_warm_up
+
+
+@st.cache_resource
+def warm_up_once():
+    """프로세스당 한 번, 다른 페이지가 쓸 무거운 라이브러리를 백그라운드에서 미리 불러 둠."""
+    return start_warm_up()
+
+
+warm_up_once()
 st.title('나의 첫 웹 서비스 만들기!')
 a=st.text_input('이름이 머누')
 b=st.selectbox('좋아하는 음식을 골라바',['마라탕', '떡볶이', '김치찌개'])
@@ -0,0 +1,70 @@
+"""MBTI 분석 페이지의 막대그래프를 만드는 함수 모음.
+
+색상 팔레트는 막대 개수별로 한 번만 계산해 두고, 그래프는 Plotly Express 대신
+막대 하나짜리 go.Bar로 만들어서 (유형 16개면 trace 16개 → 1개) 가볍게 합니다.
+"""
+from functools import lru_cache
+
+import numpy as np
+import plotly.colors as plotly_colors
+import plotly.graph_objects as go
+
+HIGHLIGHT_COLOR = "red"
+
+
+@lru_cache(maxsize=None)
+def gradient_palette(n):
+    """진한 파랑 → 밝은 파랑 그라데이션 n개 (n이 1이어도 동작)."""
+    blues = plotly_colors.sequential.Blues[::-1]  # 진한 파랑 → 밝은 파랑
+    if n <= 0:
+        return ()
+    positions = np.linspace(0, len(blues) - 1, n).astype(int)
+    return tuple(blues[i] for i in positions)
+
+
+def _bar_figure(x, y, colors, title, xaxis_title, yaxis_title):
+    fig = go.Figure(go.Bar(
+        x=x,
+        y=y,
+        text=y,
+        marker=dict(color=list(colors)),
+        texttemplate="%{text:.2%}",
+        textposition="outside",
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title=xaxis_title,
+        yaxis_title=yaxis_title,
+        showlegend=False,
+        plot_bgcolor="white",
+        yaxis=dict(tickformat=".0%"),
+    )
+    return fig
+
+
+def country_figure(matrix, country):
+    """선택한 국가의 MBTI 유형 비율 (1등 빨강, 나머지는 파란색 그라데이션)."""
+    plot_df = matrix.country_profile(country)
+    colors = (HIGHLIGHT_COLOR,) + gradient_palette(len(plot_df))[1:]
+    return _bar_figure(
+        plot_df["MBTI 유형"], plot_df["비율"], colors,
+        title=f"🇨🇴 {country}의 MBTI 유형 비율",
+        xaxis_title="MBTI 유형",
+        yaxis_title="비율 (비중)",
+    )
+
+
+def type_figure(matrix, mbti_type, n=10, highlight="South Korea"):
+    """선택한 유형의 비율이 높은 상위 n개국 (+ highlight 국가, 빨강으로 표시)."""
+    top = matrix.top_countries(mbti_type, n=n, include=highlight)
+    palette = gradient_palette(len(top))
+    colors = [
+        HIGHLIGHT_COLOR if country == highlight else palette[i]
+        for i, country in enumerate(top["Country"])
+    ]
+    return _bar_figure(
+        top["Country"], top[mbti_type], colors,
+        title=f"💡 {mbti_type} 유형 비율이 높은 상위 {n}개국 (+ {highlight} 포함)",
+        xaxis_title="국가",
+        yaxis_title=f"{mbti_type} 비율",
+    )
@@ -0,0 +1,75 @@
+"""국가별 MBTI 16유형 비율 표를 배열로 미리 정리해 두는 모듈.
+
+CSV를 한 번 읽어서 국가 × 유형 float32 행렬로 바꾸고, 유형별 국가 순위와
+국가별 유형 순위를 argsort로 미리 구해 둡니다. 화면에서 국가나 유형을
+바꿀 때는 배열 인덱스 조회만 하면 됩니다.
+"""
+import hashlib
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+# 저장소에 함께 들어 있는 기본 데이터
+DEFAULT_CSV = "countriesMBTI_16types.csv"
+
+
+def content_hash(data):
+    """업로드된 파일 내용(bytes)의 SHA-1 해시."""
+    return hashlib.sha1(data).hexdigest()
+
+
+def default_version(path=DEFAULT_CSV):
+    """기본 데이터 파일의 버전 키 (크기 + 수정 시각)."""
+    stat = os.stat(path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def read_default_csv(path=DEFAULT_CSV):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class MbtiMatrix:
+    """국가 × MBTI 유형 비율 행렬과 미리 계산한 순위."""
+
+    def __init__(self, df):
+        self.countries = df["Country"].astype(str).to_numpy()
+        self.types = [col for col in df.columns if col != "Country"]
+        self.values = df[self.types].to_numpy(dtype=np.float32)
+        self.country_index = {country: i for i, country in enumerate(self.countries)}
+        self.type_index = {mbti: j for j, mbti in enumerate(self.types)}
+
+        # 내림차순 순위 (같은 값이면 원래 순서 유지)
+        # type_rank[j] = 유형 j의 비율이 높은 국가 행 번호 순서
+        self.type_rank = np.argsort(-self.values, axis=0, kind="stable").T.copy()
+        # country_order[i] = 국가 i에서 비율이 높은 유형 열 번호 순서
+        self.country_order = np.argsort(-self.values, axis=1, kind="stable")
+
+    def country_profile(self, country):
+        """선택한 국가의 유형별 비율 (비율 내림차순)."""
+        i = self.country_index[country]
+        order = self.country_order[i]
+        return pd.DataFrame({
+            "MBTI 유형": np.asarray(self.types)[order],
+            "비율": self.values[i, order],
+        })
+
+    def top_countries(self, mbti_type, n=10, include=None):
+        """선택한 유형의 비율이 높은 상위 n개국 (include 국가가 빠졌으면 뒤에 붙임)."""
+        j = self.type_index[mbti_type]
+        rows = self.type_rank[j, :n]
+        if include in self.country_index and self.country_index[include] not in rows:
+            rows = np.append(rows, self.country_index[include])
+        return pd.DataFrame({
+            "Country": self.countries[rows],
+            mbti_type: self.values[rows, j],
+        })
+
+
+def parse_mbti_csv(data):
+    """CSV 내용(bytes)을 읽어 MbtiMatrix로 만듭니다 (digest에 내용 해시를 기록)."""
+    matrix = MbtiMatrix(pd.read_csv(io.BytesIO(data)))
+    matrix.digest = content_hash(data)
+    return matrix
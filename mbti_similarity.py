@@ -0,0 +1,136 @@
+"""MBTI 분포가 비슷한 국가 찾기와 국가 군집화.
+
+각 국가의 16유형 비율을 하나의 분포(벡터)로 보고, 코사인 거리나
+Jensen-Shannon 거리로 가까운 국가를 찾습니다. 거리 계산은 행을 블록으로
+나눠서 (블록 × 전체) 거리만 만들고 블록마다 가까운 k개만 남기므로,
+지역·도시 단위로 행이 많아져도 n × n 행렬 전체를 메모리에 두지 않습니다.
+"""
+import numpy as np
+
+METRICS = {"cosine": "코사인 거리", "jensenshannon": "Jensen-Shannon 거리"}
+
+# 한 블록에서 만드는 임시 배열의 최대 원소 수
+BLOCK_ELEMENTS = 8_000_000
+
+
+def _as_distributions(values):
+    """각 행의 합이 1이 되도록 정규화 (음수는 0으로)."""
+    values = np.clip(np.asarray(values, dtype=np.float64), 0, None)
+    sums = values.sum(axis=1, keepdims=True)
+    return values / np.where(sums > 0, sums, 1)
+
+
+def _entropy(p):
+    """마지막 축 기준, 밑이 2인 엔트로피 (0 log 0 = 0)."""
+    logs = np.log2(p, out=np.zeros_like(p), where=p > 0)
+    return -(p * logs).sum(axis=-1)
+
+
+def pairwise_distances(x, y, metric="cosine"):
+    """x의 각 행과 y의 각 행 사이 거리 행렬 (len(x) × len(y))."""
+    if metric == "cosine":
+        # 내적 한 번이면 되므로 float32로 계산
+        x = np.asarray(x, dtype=np.float32)
+        y = np.asarray(y, dtype=np.float32)
+        x_unit = x / np.maximum(np.linalg.norm(x, axis=1, keepdims=True), 1e-12)
+        y_unit = y / np.maximum(np.linalg.norm(y, axis=1, keepdims=True), 1e-12)
+        return np.clip(1.0 - x_unit @ y_unit.T, 0.0, 2.0)
+    if metric == "jensenshannon":
+        # JS(p, q) = H((p + q) / 2) - (H(p) + H(q)) / 2, 거리는 그 제곱근 (0 ~ 1)
+        p, q = _as_distributions(x), _as_distributions(y)
+        mixed = _entropy((p[:, None, :] + q[None, :, :]) / 2)
+        divergence = mixed - (_entropy(p)[:, None] + _entropy(q)[None, :]) / 2
+        return np.sqrt(np.clip(divergence, 0.0, None))
+    raise ValueError(f"지원하지 않는 거리 종류입니다: {metric}")
+
+
+def block_rows(n_rows, n_features, metric="cosine"):
+    """한 번에 거리를 계산할 행 수 (임시 배열이 BLOCK_ELEMENTS를 넘지 않도록)."""
+    per_row = n_rows * (n_features if metric == "jensenshannon" else 1)
+    return max(1, BLOCK_ELEMENTS // max(per_row, 1))
+
+
+def nearest_neighbors(values, metric="cosine", k=10):
+    """모든 행에 대해 가장 가까운 k개 행의 (번호, 거리) 배열을 미리 구합니다.
+
+    반환값 indices, distances 는 (행 수 × k) 이고 거리 오름차순입니다.
+    자기 자신은 제외합니다.
+    """
+    values = np.asarray(values)
+    n = len(values)
+    k = max(0, min(k, n - 1))
+    indices = np.empty((n, k), dtype=np.int64)
+    distances = np.empty((n, k), dtype=np.float32)
+    if k == 0:
+        return indices, distances
+
+    step = block_rows(n, values.shape[1], metric)
+    for start in range(0, n, step):
+        stop = min(start + step, n)
+        dist = pairwise_distances(values[start:stop], values, metric)
+        dist[np.arange(stop - start), np.arange(start, stop)] = np.inf
+        candidates = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        candidate_dist = np.take_along_axis(dist, candidates, axis=1)
+        order = np.argsort(candidate_dist, axis=1, kind="stable")
+        indices[start:stop] = np.take_along_axis(candidates, order, axis=1)
+        distances[start:stop] = np.take_along_axis(candidate_dist, order, axis=1)
+    return indices, distances
+
+
+def _assign(x, centers):
+    """각 행을 가장 가까운 중심에 배정하고 (라벨, 제곱거리 합)을 돌려줍니다."""
+    sq_dist = (
+        (x ** 2).sum(axis=1)[:, None]
+        - 2 * x @ centers.T
+        + (centers ** 2).sum(axis=1)[None, :]
+    )
+    labels = sq_dist.argmin(axis=1)
+    return labels, np.clip(sq_dist[np.arange(len(x)), labels], 0, None).sum()
+
+
+def _kmeans_plus_plus(x, k, rng):
+    centers = [x[rng.integers(len(x))]]
+    closest = ((x - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        total = closest.sum()
+        index = rng.choice(len(x), p=closest / total) if total > 0 else rng.integers(len(x))
+        centers.append(x[index])
+        closest = np.minimum(closest, ((x - x[index]) ** 2).sum(axis=1))
+    return np.array(centers)
+
+
+def kmeans(values, k, n_init=4, max_iter=100, seed=0):
+    """NumPy k-means (k-means++ 초기화). 군집 번호는 크기가 큰 순서로 0부터 매깁니다."""
+    x = np.asarray(values, dtype=np.float64)
+    k = max(1, min(k, len(x)))
+    rng = np.random.default_rng(seed)
+    best_labels, best_inertia = None, np.inf
+    for _ in range(n_init):
+        centers = _kmeans_plus_plus(x, k, rng)
+        for _ in range(max_iter):
+            labels, _ = _assign(x, centers)
+            counts = np.bincount(labels, minlength=k)
+            sums = np.zeros_like(centers)
+            np.add.at(sums, labels, x)
+            # 빈 군집은 이전 중심을 그대로 둠
+            new_centers = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers)
+            if np.allclose(new_centers, centers):
+                break
+            centers = new_centers
+        labels, inertia = _assign(x, centers)
+        if inertia < best_inertia:
+            best_labels, best_inertia = labels, inertia
+
+    # 큰 군집부터 0, 1, 2 ... 로 번호를 다시 매김
+    by_size = np.argsort(-np.bincount(best_labels, minlength=k), kind="stable")
+    relabel = np.empty(k, dtype=np.int64)
+    relabel[by_size] = np.arange(k)
+    return relabel[best_labels]
+
+
+def pca_2d(values):
+    """산점도용 2차원 주성분 좌표 (유형 수 × 유형 수 공분산 행렬만 분해)."""
+    x = np.asarray(values, dtype=np.float64)
+    centered = x - x.mean(axis=0)
+    _, vectors = np.linalg.eigh(centered.T @ centered)
+    return centered @ vectors[:, ::-1][:, :2]
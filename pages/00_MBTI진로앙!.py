@@ -1,9 +1,14 @@
 import streamlit as st
 
+from core.instrument import debug_panel, stage, start_run
+from recommend_engine import AXIS_LETTERS, load_engines
+
 # Streamlit MBTI 진로 추천기 (Streamlit Cloud에서 동작하도록 기본 라이브러리만 사용)
 # 사용법: MBTI 선택 -> 추천 진로 2개와 적합 학과/성격 출력
+# 잘 모르는 축이 있으면 축별로 고르고 '?'로 남겨두면, 나머지 축이 잘 맞는 진로를 점수순으로 보여줌
 
 st.set_page_config(page_title="MBTI 진로 추천기", page_icon="🎯", layout="centered")
+start_run("00_MBTI진로앙!")
 
 st.title("MBTI로 골라보는 맞춤 진로 추천 🎒")
 st.caption("16가지 MBTI 중 하나를 선택하면 청소년에게 친근한 말투로 진로 2가지를 추천해줘요.")
@@ -15,150 +20,36 @@ MBTI_LIST = [
     "ESTJ","ESFJ","ENFJ","ENTJ",
 ]
 
-# 각 MBTI에 대해 추천 진로 2개와 적합 학과/성격 설명
-CAREERS = {
-    "ISTJ": [
-        {"job": "회계사 / 세무 전문가 💼",
-         "majors": ["회계학", "경영학"],
-         "personality": "체계적이고 책임감 강함. 규칙과 절차를 잘 따르고 꼼꼼한 성격에게 적합해요."},
-        {"job": "품질관리 / 생산관리 📊",
-         "majors": ["산업공학", "기계공학", "경영학"],
-         "personality": "세세한 부분까지 챙기고 안정적으로 일하는 걸 좋아하는 사람에게 좋아요."}
-    ],
-    "ISFJ": [
-        {"job": "간호사 / 보건의료 계열 🩺",
-         "majors": ["간호학", "보건학"],
-         "personality": "다정하고 헌신적이며 사람 돌보는 걸 좋아하는 타입에게 잘 맞아요."},
-        {"job": "초등교사 / 교육지원 ✏️",
-         "majors": ["교육학", "아동학"],
-         "personality": "인내심 있고 학생들과 안정적인 관계를 만드는 데 강한 사람에게 추천해요."}
-    ],
-    "INFJ": [
-        {"job": "상담사 / 심리치료사 💬",
-         "majors": ["심리학", "상담학"],
-         "personality": "공감능력이 뛰어나고 사람의 내면을 이해하려는 성향이면 잘 맞아요."},
-        {"job": "콘텐츠 기획 / 크리에이티브 ✨",
-         "majors": ["미디어학", "문예창작", "디자인"],
-         "personality": "창의적 아이디어와 의미를 찾아내는 걸 좋아하는 사람에게 추천해요."}
-    ],
-    "INTJ": [
-        {"job": "연구개발 / 데이터과학자 🔬",
-         "majors": ["컴퓨터공학", "통계학", "수학"],
-         "personality": "논리적이고 장기 계획을 세우는 데 강한 사람에게 잘 맞아요."},
-        {"job": "전략 컨설턴트 / 기획자 📐",
-         "majors": ["경영학", "경제학", "산업공학"],
-         "personality": "문제 해결을 체계적으로 하는 걸 좋아하고 독립적으로 일하기 좋은 타입이에요."}
-    ],
-    "ISTP": [
-        {"job": "기계/전자 엔지니어 ⚙️",
-         "majors": ["기계공학", "전기전자공학"],
-         "personality": "실무 중심으로 손으로 만드는 걸 좋아하고 즉각적인 문제 해결에 강해요."},
-        {"job": "게임 개발자 / 프로그래머 🎮",
-         "majors": ["컴퓨터공학", "소프트웨어학"],
-         "personality": "호기심 많고 도구를 다루는 걸 즐긴다면 좋습니다."}
-    ],
-    "ISFP": [
-        {"job": "디자이너 / 시각예술가 🎨",
-         "majors": ["시각디자인", "미술학", "패션디자인"],
-         "personality": "감성적이고 표현을 즐기며 아름다움을 중시하는 사람에게 어울려요."},
-        {"job": "동물/환경 관련 직업 🐾",
-         "majors": ["생물학", "환경학", "동물학"],
-         "personality": "자연과 공감하고 현장 중심 활동을 좋아하는 타입에게 추천해요."}
-    ],
-    "INFP": [
-        {"job": "작가 / 에디터 ✍️",
-         "majors": ["문예창작", "국어국문학", "미디어학"],
-         "personality": "내면의 가치와 스토리를 중요시하고 창작을 즐기는 사람에게 좋아요."},
-        {"job": "NGO / 사회적기업 활동가 🤝",
-         "majors": ["사회복지학", "국제관계학", "사회학"],
-         "personality": "이상과 가치를 실현하려는 열정이 있는 사람에게 추천해요."}
-    ],
-    "INTP": [
-        {"job": "연구원 / 학자 🧠",
-         "majors": ["수학", "물리학", "컴퓨터공학"],
-         "personality": "이론을 탐구하고 개념을 분석하는 걸 즐기는 타입에게 적합해요."},
-        {"job": "소프트웨어 아키텍트 / 개발자 💻",
-         "majors": ["컴퓨터공학", "소프트웨어학"],
-         "personality": "문제에 대한 논리적 접근을 좋아하고 자율적으로 일하는 걸 선호해요."}
-    ],
-    "ESTP": [
-        {"job": "영업 / 마케팅 실무자 📣",
-         "majors": ["경영학", "광고홍보학", "마케팅"],
-         "personality": "사교적이고 행동력이 뛰어나며 즉각적인 결과를 즐기는 사람에게 좋아요."},
-        {"job": "응급 구조대 / 현장 기술자 🚑",
-         "majors": ["응급구조학", "기계공학", "전기공학"],
-         "personality": "빠른 판단과 행동이 필요한 환경에서 잘 적응해요."}
-    ],
-    "ESFP": [
-        {"job": "공연/엔터테인먼트 아티스트 🎤",
-         "majors": ["연기/뮤지컬", "음악학", "무대예술"],
-         "personality": "사람들과 함께하고 무대에서 에너지를 주고받는 걸 즐기는 타입이에요."},
-        {"job": "이벤트 기획 / 호스피탈리티 🥳",
-         "majors": ["관광학", "호텔경영", "경영학"],
-         "personality": "사교적이고 현장 중심으로 사람을 즐겁게 만드는 재능이 있어요."}
-    ],
-    "ENFP": [
-        {"job": "창업가 / 스타트업 실무 🌱",
-         "majors": ["경영학", "창업학", "컴퓨터공학(비즈)"],
-         "personality": "아이디어가 풍부하고 도전을 즐기며 사람을 끌어모으는 매력이 있어요."},
-        {"job": "광고 기획 / 크리에이터 📣",
-         "majors": ["광고홍보학", "미디어학", "디자인"],
-         "personality": "창의력과 사람을 공감시키는 커뮤니케이션 능력이 강해요."}
-    ],
-    "ENTP": [
-        {"job": "제품 기획 / 비즈니스 전략가 ⚡",
-         "majors": ["경영학", "산업공학", "정보시스템"],
-         "personality": "다양한 아이디어로 문제를 찢고 새 기회를 찾아내는 데 능해요."},
-        {"job": "변호사 / 논리 기반 직업 ⚖️",
-         "majors": ["법학", "정치외교학"],
-         "personality": "토론을 즐기고 논리적으로 설득하는 능력이 뛰어난 타입이에요."}
-    ],
-    "ESTJ": [
-        {"job": "공기업/행정직 🔧",
-         "majors": ["행정학", "경영학", "법학"],
-         "personality": "조직을 관리하고 규칙을 지켜 안정적으로 운영하는 걸 좋아해요."},
-        {"job": "프로젝트 매니저 / 운영관리 📅",
-         "majors": ["경영학", "산업공학"],
-         "personality": "리더십과 추진력이 강하고 실무 조직을 이끄는 데 적합해요."}
-    ],
-    "ESFJ": [
-        {"job": "HR / 인사관리 👥",
-         "majors": ["경영학", "심리학", "사회학"],
-         "personality": "사람을 챙기고 팀의 분위기를 살리는 데 재능이 있어요."},
-        {"job": "병원 행정 / 의료 서비스 관리 🏥",
-         "majors": ["보건행정학", "경영학"],
-         "personality": "서비스 정신과 협업을 중요하게 생각하는 사람에게 좋아요."}
-    ],
-    "ENFJ": [
-        {"job": "교육자 / 리더십 코치 🌟",
-         "majors": ["교육학", "심리학", "경영학"],
-         "personality": "타인을 이끌고 북돋는 걸 좋아하며 사회적 영향력이 큰 역할에 잘 맞아요."},
-        {"job": "PR / 커뮤니케이션 책임자 🗣️",
-         "majors": ["미디어학", "광고홍보학", "경영학"],
-         "personality": "사람들과의 연결과 대외 소통에 강한 사람에게 추천해요."}
-    ],
-    "ENTJ": [
-        {"job": "경영진 / CEO 후보 💼",
-         "majors": ["경영학", "경제학", "산업공학"],
-         "personality": "목표 지향적이고 조직을 이끄는 데 자신감과 추진력이 있는 타입이에요."},
-        {"job": "전략 컨설턴트 / 투자분석가 📈",
-         "majors": ["경영학", "경제학", "금융학"],
-         "personality": "복잡한 비즈니스 문제를 구조화하고 해결하는 걸 즐기는 사람에게 추천해요."}
-    ],
-}
+# 진로마다 E/I, S/N, T/F, J/P 성향 가중치가 붙어 있고 (data/recommendations.json),
+# 16유형 순위는 프로세스당 한 번만 미리 계산해 둠
+CAREERS = load_engines()["careers"]
 
 # 기본 UI
-selected = st.selectbox("당신의 MBTI를 선택해줘 😊", MBTI_LIST)
+unsure = st.toggle("아직 잘 모르는 성향이 있어요 🤔 (축별로 고르기)")
+if unsure:
+    cols = st.columns(len(AXIS_LETTERS))
+    letters = [
+        col.radio(f"{first} / {second}", [first, "?", second], index=1, key=f"axis_{first}{second}")
+        for col, (first, second) in zip(cols, AXIS_LETTERS)
+    ]
+    selected = "".join(letters)
+else:
+    selected = st.selectbox("당신의 MBTI를 선택해줘 😊", MBTI_LIST)
+count = st.slider("추천 받을 진로 수", 1, 6, 2)
 
 if selected:
     st.markdown(f"### `{selected}` 님을 위한 추천 진로 ✨")
-    options = CAREERS.get(selected, [])
-    for idx, opt in enumerate(options, start=1):
+    with stage("recommend"):
+        options = CAREERS.recommend(selected, count)
+    for idx, (opt, match) in enumerate(options, start=1):
         st.subheader(f"{idx}. {opt['job']}")
+        st.caption(f"성향 일치도 {match:.0%} · {opt['mbti']} 유형 추천 진로")
         st.write(f"**추천 학과:** {', '.join(opt['majors'])}")
         st.write(f"**어떤 성격이 잘 맞을까?** {opt['personality']}")
         st.write("---")
 
 st.info("참고: 이 추천은 일반적인 성향 기반 제안이에요. 실제 진로 선택은 체험, 상담, 관심사 등을 함께 고려하세요! 😊")
 
+debug_panel()
+
 # 끝
@@ -1,7 +1,12 @@
 import streamlit as st
 
+from core.instrument import debug_panel, stage, start_run
+from recommend_engine import AXIS_LETTERS, load_engines
+from recommendations import load_store
+
 # 앱 제목
 st.set_page_config(page_title="MBTI 맞춤 책 & 영화 추천 🎬📚", page_icon="✨")
+start_run("01_MBTI책영화추천ㅈㅈ")
 st.title("✨ MBTI별 책 & 영화 추천 ✨")
 st.write("너의 MBTI를 골라봐! 그 성격에 딱 맞는 책과 영화를 추천해줄게 😎")
 
@@ -12,97 +17,38 @@ mbti_list = [
     "ISTJ", "ISFJ", "ESTJ", "ESFJ",
     "ISTP", "ISFP", "ESTP", "ESFP"
 ]
-mbti = st.selectbox("👉 너의 MBTI를 선택해줘", mbti_list)
+if st.toggle("잘 모르는 성향은 '?'로 남겨둘래 🤔"):
+    cols = st.columns(len(AXIS_LETTERS))
+    mbti = "".join(
+        col.radio(f"{first} / {second}", [first, "?", second], index=1, key=f"axis_{first}{second}")
+        for col, (first, second) in zip(cols, AXIS_LETTERS)
+    )
+else:
+    mbti = st.selectbox("👉 너의 MBTI를 선택해줘", mbti_list)
+count = st.slider("작품 수", 1, 6, 2)
 
-# 추천 데이터
-recommendations = {
-    "INTJ": {
-        "books": ["1984 - 조지 오웰", "미래의 물결 - 앨빈 토플러"],
-        "movies": ["인터스텔라", "인셉션"],
-        "reason": "계획적이고 분석적인 INTJ에게는 깊은 사고와 미래적 시각을 자극하는 작품들이 잘 어울려요 🤓"
-    },
-    "INTP": {
-        "books": ["총, 균, 쇠 - 재레드 다이아몬드", "이기적 유전자 - 리처드 도킨스"],
-        "movies": ["트루먼 쇼", "매트릭스"],
-        "reason": "호기심이 넘치고 논리적인 INTP는 세상의 본질을 탐구하는 이야기에서 흥미를 느껴요 🧠"
-    },
-    "ENTJ": {
-        "books": ["손자병법", "성공하는 사람들의 7가지 습관"],
-        "movies": ["더 울프 오브 월 스트리트", "킹스맨"],
-        "reason": "리더십이 강한 ENTJ에게는 전략적이고 목표지향적인 내용이 잘 맞아요 💼🔥"
-    },
-    "ENTP": {
-        "books": ["괴짜경제학", "생각의 탄생"],
-        "movies": ["아이언맨", "캐치 미 이프 유 캔"],
-        "reason": "아이디어 뱅크 ENTP에게는 자유롭고 창의적인 스토리가 딱이에요 😎💡"
-    },
-    "INFJ": {
-        "books": ["데미안 - 헤르만 헤세", "작은 아씨들 - 루이자 메이 올컷"],
-        "movies": ["어바웃 타임", "월터의 상상은 현실이 된다"],
-        "reason": "깊은 감성과 가치관을 중시하는 INFJ에게는 자기 성찰과 따뜻한 메시지가 있는 작품이 좋아요 💖"
-    },
-    "INFP": {
-        "books": ["연을 쫓는 아이", "달과 6펜스"],
-        "movies": ["빅 피쉬", "이터널 선샤인"],
-        "reason": "감성적이고 이상주의적인 INFP는 꿈과 감정이 어우러진 이야기에 몰입해요 🌙🌸"
-    },
-    "ENFJ": {
-        "books": ["사피엔스", "말의 품격"],
-        "movies": ["굿 윌 헌팅", "죽은 시인의 사회"],
-        "reason": "사람 중심의 ENFJ는 인간의 성장과 관계에 대한 스토리에 마음이 끌려요 🤝✨"
-    },
-    "ENFP": {
-        "books": ["오만과 편견", "모모"],
-        "movies": ["라라랜드", "인사이드 아웃"],
-        "reason": "에너지 넘치고 상상력 풍부한 ENFP에게는 감정이 풍부한 작품이 잘 어울려요 🌈💫"
-    },
-    "ISTJ": {
-        "books": ["시간의 역사 - 스티븐 호킹", "성실함의 힘"],
-        "movies": ["쉰들러 리스트", "캐스트 어웨이"],
-        "reason": "책임감 강하고 실용적인 ISTJ에게는 현실적이고 의미 있는 이야기가 잘 맞아요 🧩"
-    },
-    "ISFJ": {
-        "books": ["작은 왕자", "나미야 잡화점의 기적"],
-        "movies": ["업", "원더"],
-        "reason": "따뜻하고 헌신적인 ISFJ는 감동과 배려가 담긴 작품을 좋아해요 💕"
-    },
-    "ESTJ": {
-        "books": ["원칙 - 레이 달리오", "성공의 법칙"],
-        "movies": ["머니볼", "소셜 네트워크"],
-        "reason": "현실적이고 조직적인 ESTJ에게는 목표와 결과 중심의 이야기가 딱이에요 💪"
-    },
-    "ESFJ": {
-        "books": ["인간관계론 - 데일 카네기", "감정의 힘"],
-        "movies": ["인턴", "포레스트 검프"],
-        "reason": "사람들과의 연결을 중요시하는 ESFJ에게는 따뜻한 인간 관계가 중심인 이야기가 좋아요 😊"
-    },
-    "ISTP": {
-        "books": ["어떻게 살 것인가 - 유시민", "탐정 갈릴레오"],
-        "movies": ["본 아이덴티티", "매드맥스: 분노의 도로"],
-        "reason": "논리적이고 행동파인 ISTP는 문제 해결과 액션이 있는 작품에서 흥미를 느껴요 ⚙️"
-    },
-    "ISFP": {
-        "books": ["노르웨이의 숲", "보통의 존재"],
-        "movies": ["월-E", "비긴 어게인"],
-        "reason": "감성적이고 자유로운 ISFP는 따뜻하고 음악적인 이야기에서 위로를 받아요 🎵🌷"
-    },
-    "ESTP": {
-        "books": ["부의 추월차선", "도전하는 힘"],
-        "movies": ["분노의 질주", "미션 임파서블"],
-        "reason": "모험심 넘치는 ESTP는 속도감 있고 짜릿한 이야기를 좋아해요 🏎️🔥"
-    },
-    "ESFP": {
-        "books": ["나를 사랑하는 연습", "트렌드 코리아"],
-        "movies": ["맘마미아!", "위대한 쇼맨"],
-        "reason": "사교적이고 활발한 ESFP는 긍정 에너지가 가득한 작품에 끌려요 🎉💃"
-    },
-}
+# 추천 데이터 (data/recommendations.json, 프로세스당 한 번만 읽음)
+# 책·영화마다 성향 가중치가 있어서 점수 순으로 고르고, 16유형 순위는 미리 계산해 둠
+recommendations = load_store()["media"]
+engines = load_engines()
 
 # 결과 표시
 if mbti:
-    data = recommendations[mbti]
+    with stage("recommend"):
+        books = engines["books"].recommend(mbti, count)
+        movies = engines["movies"].recommend(mbti, count)
     st.subheader(f"🌟 {mbti} 유형을 위한 추천 🌟")
-    st.markdown(f"**📚 책 추천:** {', '.join(data['books'])}")
-    st.markdown(f"**🎬 영화 추천:** {', '.join(data['movies'])}")
-    st.info(data["reason"])
+    st.markdown(f"**📚 책 추천:** {', '.join(item['title'] for item, _ in books)}")
+    st.markdown(f"**🎬 영화 추천:** {', '.join(item['title'] for item, _ in movies)}")
+    # 추천 이유는 가장 잘 맞는 책이 나온 유형의 설명을 보여줌
+    # ('?'가 있어서 여러 유형이 같은 점수면 한 유형을 고를 수 없으므로 이유 대신 안내)
+    best = engines["books"].best_type(mbti)
+    if best is None:
+        st.info("모르는 성향이 있어서 여러 유형이 똑같이 잘 맞아! '?'를 줄이면 딱 맞는 이유도 알려줄게 😉")
+    else:
+        if best != mbti:
+            st.caption(f"가장 가까운 유형: {best}")
+        st.info(recommendations[best]["reason"])
     st.success("📖 마음에 드는 작품이 있다면 오늘 바로 찾아봐도 좋을 것 같아!")
+
+debug_panel()
@@ -1,10 +1,19 @@
 # app.py
+import hashlib
+import json
+import threading
+
 import streamlit as st
 from streamlit_folium import st_folium
 import folium
 
+from core.instrument import debug_panel, stage, start_run, tracked
+from itinerary import ItineraryPlanner, station_index
+
 st.set_page_config(page_title="서울 여행 추천 지도", layout="wide")
 
+start_run("02_관광지")
+
 # ------------------ 제목 ------------------
 st.title("🇰🇷 외국인이 사랑하는 서울 관광지 Top 10")
 st.markdown(
@@ -16,87 +25,114 @@ st.markdown(
 )
 
 # ------------------ 관광지 데이터 ------------------
+# stay: 둘러보는 데 걸리는 대략적인 시간 (분, 일정 짜기에 사용)
 places = [
     {
         "name": "경복궁",
         "coords": (37.579617, 126.977041),
         "desc": "조선의 대표 궁궐로, 한복을 입고 사진 찍기 좋은 명소예요 👑",
         "subway": "🚇 3호선 경복궁역",
+        "stay": 120,
     },
     {
         "name": "창덕궁",
         "coords": (37.582600, 126.991000),
         "desc": "유네스코 세계문화유산으로 지정된 고궁이에요. 후원(비원)이 특히 유명해요 🍃",
         "subway": "🚇 3호선 안국역",
+        "stay": 120,
     },
     {
         "name": "북촌한옥마을",
         "coords": (37.582542, 126.983047),
         "desc": "전통 한옥이 모여 있는 아름다운 골목길로, 한복 체험도 가능해요 🏠",
         "subway": "🚇 3호선 안국역",
+        "stay": 90,
     },
     {
         "name": "인사동",
         "coords": (37.576540, 126.985120),
         "desc": "전통 찻집과 공예품 상점이 모여 있는 한국적인 거리 🎎",
         "subway": "🚇 3호선 안국역",
+        "stay": 60,
     },
     {
         "name": "명동",
         "coords": (37.560988, 126.985385),
         "desc": "쇼핑과 길거리 음식으로 유명한 활기찬 거리 🛍️",
         "subway": "🚇 4호선 명동역",
+        "stay": 90,
     },
     {
         "name": "N서울타워 (남산타워)",
         "coords": (37.551169, 126.988227),
         "desc": "서울의 전경을 한눈에 볼 수 있는 전망 명소 🌃",
         "subway": "🚇 4호선 명동역",
+        "stay": 120,
     },
     {
         "name": "동대문디자인플라자 (DDP)",
         "coords": (37.566295, 127.009356),
         "desc": "디자인, 전시, 야시장 등 현대적인 서울의 상징 ✨",
         "subway": "🚇 2·4·5호선 동대문역사문화공원역",
+        "stay": 90,
     },
     {
         "name": "홍대",
         "coords": (37.556264, 126.923965),
         "desc": "젊음의 거리! 버스킹과 예술적인 분위기가 가득해요 🎸",
         "subway": "🚇 2호선 홍대입구역",
+        "stay": 120,
     },
     {
         "name": "광장시장",
         "coords": (37.570375, 126.999186),
         "desc": "빈대떡, 마약김밥 등 한국 전통 먹거리의 천국 🍢",
         "subway": "🚇 1호선 종로5가역",
+        "stay": 60,
     },
     {
         "name": "코엑스·스타필드 도서관",
         "coords": (37.512050, 127.058647),
         "desc": "대형 쇼핑몰과 인스타 감성 도서관이 함께 있는 명소 📚",
         "subway": "🚇 2호선 삼성역",
+        "stay": 120,
     },
 ]
 
 # ------------------ 지도 ------------------
-center = [37.5665, 126.9780]
-m = folium.Map(location=center, zoom_start=12, tiles="OpenStreetMap")
-
-for p in places:
-    popup_html = f"""
-    <b>{p['name']}</b><br>
-    {p['desc']}<br>
-    {p['subway']}
+# 관광지 목록이 바뀌면 버전도 바뀌어서 지도를 다시 만듭니다.
+PLACES_VERSION = hashlib.sha1(
+    json.dumps(places, ensure_ascii=False, sort_keys=True).encode("utf-8")
+).hexdigest()[:12]
+
+@tracked(st.cache_resource)
+def build_base_map(version, _places):
+    """관광지 마커가 올라간 지도를 관광지 데이터 버전마다 한 번만 만듭니다.
+
+    st_folium이 그릴 때 지도 객체를 조금씩 고치므로, 여러 세션이 같은 지도를
+    동시에 그리지 않도록 잠금도 함께 돌려줍니다.
     """
-    folium.Marker(
-        location=p["coords"],
-        popup=popup_html,
-        tooltip=p["name"],
-        icon=folium.Icon(color="pink", icon="info-sign"),
-    ).add_to(m)
+    center = [37.5665, 126.9780]
+    m = folium.Map(location=center, zoom_start=12, tiles="OpenStreetMap")
+
+    for p in _places:
+        popup_html = f"""
+        <b>{p['name']}</b><br>
+        {p['desc']}<br>
+        {p['subway']}
+        """
+        folium.Marker(
+            location=p["coords"],
+            popup=popup_html,
+            tooltip=p["name"],
+            icon=folium.Icon(color="pink", icon="info-sign"),
+        ).add_to(m)
+    return m, threading.Lock()
 
-st_folium(m, width=630, height=420)
+base_map, map_lock = build_base_map(PLACES_VERSION, places)
+with map_lock, stage("st_folium"):
+    # returned_objects=[]: 지도를 움직이거나 클릭해도 페이지를 다시 실행하지 않음
+    st_folium(base_map, width=630, height=420, returned_objects=[], key=f"places_map_{PLACES_VERSION}")
 
 # ------------------ 관광지 요약 ------------------
 st.markdown("### 📍 관광지 요약")
@@ -107,65 +143,65 @@ for i, p in enumerate(places, start=1):
 st.markdown("---")
 st.markdown("## 🗓️ 나만의 서울 여행 일정 만들기")
 
-day = st.selectbox("여행 일수를 선택하세요 👇", ["1일차", "2일차", "3일차"])
-
-if day == "1일차":
-    st.success("✨ 1일차 일정 (전통 & 중심지 여행 루트)")
-    st.write("""
-    **오전** ☀️  
-    - 경복궁 → 북촌한옥마을 → 인사동  
-    - 전통 문화 체험과 한복 사진 📸  
-    
-    **점심 🍱**  
-    - 인사동 골목 내 전통 한식집 ‘오세계향’ 추천  
-    
-    **오후 🌇**  
-    - 명동 쇼핑거리 → 남산 케이블카 → N서울타워 전망대  
-    
-    **저녁 🍜**  
-    - 명동 교자나 부탄식당에서 따뜻한 식사  
-    
-    **야간 🌃**  
-    - N서울타워 야경 감상 후 숙소 귀가  
-    """)
-
-elif day == "2일차":
-    st.success("✨ 2일차 일정 (현대적 서울 & 쇼핑 루트)")
-    st.write("""
-    **오전** ☀️  
-    - 동대문디자인플라자(DDP) 관람 → 광장시장 구경  
-    
-    **점심 🍱**  
-    - 광장시장에서 빈대떡 & 마약김밥 점심  
-    
-    **오후 🌇**  
-    - 명동 거리 쇼핑 → 코엑스 스타필드 도서관 방문  
-    
-    **저녁 🍜**  
-    - 삼성역 근처 한식 뷔페 or 비빔밥 전문점  
-    
-    **야간 🌃**  
-    - 코엑스 주변 야경 산책  
-    """)
-
-else:
-    st.success("✨ 3일차 일정 (예술과 젊음의 거리 루트)")
-    st.write("""
-    **오전** ☀️  
-    - 창덕궁 → 경복궁 재방문 또는 한복체험  
-    
-    **점심 🍱**  
-    - 북촌 카페거리에서 한식 브런치  
-    
-    **오후 🌇**  
-    - 홍대 거리 산책, 플리마켓 & 버스킹 관람  
-    
-    **저녁 🍜**  
-    - 홍대입구역 주변 맛집 ‘연남서식당’ 추천  
-    
-    **야간 🌃**  
-    - 홍대 클럽거리 또는 공연 카페 탐방  
-    """)
+@tracked(st.cache_resource)
+def build_planner(version, _places):
+    """관광지 거리 행렬과 관광지마다 가장 가까운 역을 데이터 버전마다 한 번만 계산합니다."""
+    planner = ItineraryPlanner([p["coords"] for p in _places], [p["stay"] for p in _places])
+    index, stations = station_index()
+    nearest = []
+    for lat, lon in planner.coords:
+        (i,), (km,) = index.nearest(lat, lon)
+        nearest.append((stations["역명"].iat[i], stations["호선"].iat[i], km))
+    return planner, nearest
+
+def station_label(name):
+    return name if name.endswith("역") else f"{name}역"
+
+def clock(start_hour, minutes):
+    total = int(round(start_hour * 60 + minutes))
+    return f"{total // 60:02d}:{total % 60:02d}"
+
+# 일정 부분만 다시 실행 (조건을 바꿔도 위의 지도는 다시 만들거나 보내지 않음)
+@st.fragment
+def itinerary_section():
+    planner, nearest_station = build_planner(PLACES_VERSION, places)
+    _, stations = station_index()
+    station_names = list(dict.fromkeys(stations["역명"]))
+
+    col1, col2, col3 = st.columns(3)
+    days = col1.slider("여행 일수", 1, 5, 3)
+    hours = col2.slider("하루 여행 시간 (시간)", 4, 14, 10)
+    start_hour = col3.slider("출발 시각", 7, 12, 9)
+    home = st.selectbox("숙소에서 가까운 역 (매일 여기서 출발하고 돌아와요) 🏨", station_names, index=station_names.index("명동"))
+    home_row = stations[stations["역명"] == home].iloc[0]
+
+    with stage("itinerary.plan"):
+        plans, left = planner.plan(days, hours * 60, (home_row["위도"], home_row["경도"]))
+    if not plans:
+        st.warning("하루 시간 안에 다녀올 수 있는 관광지가 없어요. 여행 시간을 늘려 보세요!")
+        return
+
+    tabs = st.tabs([f"{i}일차" for i in range(1, len(plans) + 1)])
+    for day_no, (tab, plan) in enumerate(zip(tabs, plans), start=1):
+        with tab:
+            route = " → ".join(places[i]["name"] for i in plan.stops)
+            st.success(f"✨ {day_no}일차 일정: {route}")
+            lines = [f"**{clock(start_hour, 0)}** 🏨 {station_label(home)} 출발"]
+            for stop, arrive, depart, leg in zip(plan.stops, plan.arrive, plan.depart, plan.legs):
+                station, line, km = nearest_station[stop]
+                lines.append(
+                    f"**{clock(start_hour, arrive)} ~ {clock(start_hour, depart)}** {places[stop]['name']}"
+                    f" (이동 {leg:.0f}분 · 🚇 {line} {station_label(station)} {km:.1f}km)"
+                )
+            lines.append(f"**{clock(start_hour, plan.total)}** 🏨 {station_label(home)} 도착 (돌아오는 길 {plan.back:.0f}분)")
+            st.markdown("  \n".join(lines))
+
+    if len(left):
+        st.info("시간이 모자라 빠진 곳: " + ", ".join(places[i]["name"] for i in left))
+
+itinerary_section()
 
 st.markdown("---")
 st.caption("🗺️ 데이터 출처: TripAdvisor, VisitSeoul, Lonely Planet / 앱 목적: 관광 정보 제공용")
+
+debug_panel()
@@ -3,116 +3,167 @@ import pandas as pd
 import plotly.express as px
 import numpy as np
 
+from core.instrument import debug_panel, stage, start_run, tracked
+from mbti_data import DEFAULT_CSV, content_hash, default_version, parse_mbti_csv, read_default_csv
+from mbti_charts import country_figure, type_figure
+from mbti_similarity import METRICS, kmeans, nearest_neighbors, pca_2d
+
+# 비슷한 국가 탭에서 고를 수 있는 최대 국가 수
+MAX_NEIGHBORS = 20
+# 비슷한 국가 탭을 보여 줄 최소 국가 수 (기준 국가 + 비슷한 국가 3개)
+MIN_COUNTRIES = 4
+# 군집 수 슬라이더의 최댓값
+MAX_CLUSTERS = 10
+
+# 업로드한 파일마다 캐시가 생기므로 최근 데이터 몇 개분만 프로세스 메모리에 남깁니다.
+MAX_DATASETS = 4
+# 선택별 그래프는 데이터마다 국가 수(약 160)만큼 생길 수 있어 따로 제한합니다.
+MAX_FIGURES = 256
+
 st.set_page_config(page_title="🌍 MBTI 국가/유형별 시각화", layout="centered")
 
+start_run("03_MBTI분석")
+
 st.title("🌍 MBTI 국가 및 유형별 시각화")
 st.markdown("""
 MBTI 16유형의 전 세계 분포를 한눈에 볼 수 있는 대시보드입니다.  
 **탭을 전환**해 국가별 혹은 유형별 데이터를 확인해보세요.
 """)
 
-# --- 파일 업로드 ---
-uploaded_file = st.file_uploader("📂 MBTI 국가별 데이터 파일 업로드 (countriesMBTI_16types.csv)", type=["csv"])
+# 파일 내용의 해시가 같으면 다시 파싱하지 않고 미리 계산한 행렬을 재사용합니다.
+# (모든 세션이 같은 행렬 하나를 공유)
+@tracked(st.cache_resource(max_entries=MAX_DATASETS))
+def load_matrix(digest, _data):
+    return parse_mbti_csv(_data)
 
-if uploaded_file:
-    df = pd.read_csv(uploaded_file)
-
-    # Tabs
-    tab1, tab2 = st.tabs(["🌎 국가별 보기", "💡 MBTI 유형별 보기"])
-
-    # ==========================
-    # 1️⃣ 국가별 보기
-    # ==========================
-    with tab1:
-        countries = df["Country"].unique()
-        selected_country = st.selectbox("🌍 국가를 선택하세요", countries)
-
-        # 선택한 국가의 데이터
-        country_data = df[df["Country"] == selected_country].iloc[0, 1:]
-        mbti_types = country_data.index.tolist()
-        mbti_values = country_data.values
-
-        # 데이터프레임 구성
-        plot_df = pd.DataFrame({
-            "MBTI 유형": mbti_types,
-            "비율": mbti_values
-        }).sort_values(by="비율", ascending=False)
-
-        # 색상 처리 (1등 빨강, 나머지는 파란색 그라데이션 반대: 진한 → 밝은)
-        n = len(plot_df)
-        gradient_colors = px.colors.sequential.Blues[::-1]  # 진한 파랑 → 밝은 파랑
-        color_scale = [gradient_colors[int(i * (len(gradient_colors)-1) / (n-1))] for i in range(n)]
-        colors = ["red" if i == 0 else color_scale[i] for i in range(n)]
-
-        fig1 = px.bar(
-            plot_df,
-            x="MBTI 유형",
-            y="비율",
-            text="비율",
-            color=plot_df["MBTI 유형"],
-            color_discrete_sequence=colors,
-        )
-
-        fig1.update_traces(texttemplate="%{text:.2%}", textposition="outside")
-        fig1.update_layout(
-            title=f"🇨🇴 {selected_country}의 MBTI 유형 비율",
-            xaxis_title="MBTI 유형",
-            yaxis_title="비율 (비중)",
-            showlegend=False,
-            plot_bgcolor="white",
-            yaxis=dict(tickformat=".0%"),
-        )
+# 기본 데이터(countriesMBTI_16types.csv)는 파일이 바뀔 때만 다시 읽습니다.
+@tracked(st.cache_resource)
+def load_default_matrix(version):
+    data = read_default_csv()
+    return load_matrix(content_hash(data), data)
+
+# --- 파일 업로드 (선택: 올리면 기본 데이터 대신 사용) ---
+uploaded_file = st.file_uploader("📂 다른 MBTI 국가별 데이터 파일 업로드 (선택, 기본: countriesMBTI_16types.csv)", type=["csv"])
 
+if uploaded_file:
+    data = uploaded_file.getvalue()
+    matrix = load_matrix(content_hash(data), data)
+    st.caption(f"업로드한 파일 `{uploaded_file.name}`의 데이터를 표시합니다.")
+else:
+    matrix = load_default_matrix(default_version())
+    st.caption(f"기본 데이터 `{DEFAULT_CSV}`를 표시합니다.")
+
+# 거리 종류별 가까운 국가 목록과 군집 결과는 데이터마다 한 번만 계산합니다.
+@tracked(st.cache_resource(max_entries=MAX_DATASETS * len(METRICS)))
+def load_neighbors(digest, metric, _matrix):
+    return nearest_neighbors(_matrix.values, metric, k=MAX_NEIGHBORS)
+
+@tracked(st.cache_resource(max_entries=MAX_DATASETS * (MAX_CLUSTERS - 1)))
+def load_clusters(digest, n_clusters, _matrix):
+    return kmeans(_matrix.values, n_clusters)
+
+@tracked(st.cache_resource(max_entries=MAX_DATASETS))
+def load_pca(digest, _matrix):
+    return pca_2d(_matrix.values)
+
+# 선택별로 완성된 Figure 객체를 캐시해서 같은 선택이면 Plotly로 다시 만들지 않습니다.
+# (JSON으로 캐시하면 st.plotly_chart가 매번 dict 전체를 다시 검증하므로 객체를 그대로 넘김)
+# 모든 세션이 같은 객체를 공유하므로 읽기만 하고 수정하지 않습니다.
+@tracked(st.cache_resource(max_entries=MAX_FIGURES))
+def load_country_figure(digest, country, _matrix):
+    return country_figure(_matrix, country)
+
+@tracked(st.cache_resource(max_entries=MAX_FIGURES))
+def load_type_figure(digest, mbti_type, _matrix):
+    return type_figure(_matrix, mbti_type, n=10, highlight="South Korea")
+
+# Tabs
+tab1, tab2, tab3 = st.tabs(["🌎 국가별 보기", "💡 MBTI 유형별 보기", "🤝 비슷한 국가 찾기"])
+
+# ==========================
+# 1️⃣ 국가별 보기
+# ==========================
+with tab1:
+    selected_country = st.selectbox("🌍 국가를 선택하세요", matrix.countries)
+
+    # 선택한 국가의 유형별 비율 (1등 빨강, 나머지는 파란색 그라데이션: 진한 → 밝은)
+    fig1 = load_country_figure(matrix.digest, selected_country, matrix)
+
+    with stage("plotly_chart"):
         st.plotly_chart(fig1, use_container_width=True)
 
-    # ==========================
-    # 2️⃣ MBTI 유형별 보기
-    # ==========================
-    with tab2:
-        mbti_columns = [col for col in df.columns if col != "Country"]
-        selected_type = st.selectbox("💡 MBTI 유형을 선택하세요", mbti_columns)
-
-        # 선택한 유형의 상위 10개국
-        top_countries = df[["Country", selected_type]].sort_values(by=selected_type, ascending=False)
-
-        # South Korea 포함 여부 확인
-        if "South Korea" not in top_countries["Country"].head(10).values:
-            top10 = pd.concat([
-                top_countries.head(10),
-                top_countries[top_countries["Country"] == "South Korea"]
-            ])
-        else:
-            top10 = top_countries.head(10)
-
-        # 색상 처리 (한국은 빨강, 나머지는 파란색 그라데이션 반대)
-        n2 = len(top10)
-        gradient_colors2 = px.colors.sequential.Blues[::-1]  # 진한 → 밝은
-        color_scale2 = [gradient_colors2[int(i * (len(gradient_colors2)-1) / (n2-1))] for i in range(n2)]
-        colors2 = [
-            "red" if c == "South Korea" else color_scale2[i]
-            for i, c in enumerate(top10["Country"])
-        ]
-
-        fig2 = px.bar(
-            top10,
-            x="Country",
-            y=selected_type,
-            text=selected_type,
-            color="Country",
-            color_discrete_sequence=colors2
-        )
-
-        fig2.update_traces(texttemplate="%{text:.2%}", textposition="outside")
-        fig2.update_layout(
-            title=f"💡 {selected_type} 유형 비율이 높은 상위 10개국 (+ South Korea 포함)",
-            xaxis_title="국가",
-            yaxis_title=f"{selected_type} 비율",
-            showlegend=False,
-            plot_bgcolor="white",
-            yaxis=dict(tickformat=".0%"),
-        )
+# ==========================
+# 2️⃣ MBTI 유형별 보기
+# ==========================
+with tab2:
+    selected_type = st.selectbox("💡 MBTI 유형을 선택하세요", matrix.types)
 
+    # 선택한 유형의 상위 10개국 (South Korea가 빠졌으면 뒤에 포함, 한국은 빨강)
+    fig2 = load_type_figure(matrix.digest, selected_type, matrix)
+
+    with stage("plotly_chart"):
         st.plotly_chart(fig2, use_container_width=True)
 
-else:
-    st.info("CSV 파일을 업로드하면 시각화를 시작할 수 있습니다. 😊")
+# ==========================
+# 3️⃣ 비슷한 국가 찾기
+# ==========================
+with tab3:
+    st.markdown("선택한 국가와 **MBTI 분포가 가장 비슷한 나라**를 찾고, 전체 국가를 비슷한 분포끼리 묶어 봐요.")
+    if len(matrix.countries) < MIN_COUNTRIES:
+        st.info(f"비교하려면 국가가 {MIN_COUNTRIES}개 이상 필요해요. (현재 {len(matrix.countries)}개)")
+    else:
+        base_country = st.selectbox("🌍 기준 국가를 선택하세요", matrix.countries, key="similar_country")
+        metric = st.radio("거리 종류", list(METRICS), format_func=METRICS.get, horizontal=True)
+        max_k = min(MAX_NEIGHBORS, len(matrix.countries) - 1)
+        # 국가가 4개뿐이면 고를 값이 하나라 슬라이더 없이 그대로 씀 (최솟값 = 최댓값이면 오류)
+        k = st.slider("비슷한 국가 수", 3, max_k, min(10, max_k)) if max_k > 3 else max_k
+
+        # 미리 구해 둔 이웃 목록에서 조회 (거리 오름차순)
+        neighbor_index, neighbor_dist = load_neighbors(matrix.digest, metric, matrix)
+        row = matrix.country_index[base_country]
+        similar = pd.DataFrame({
+            "Country": matrix.countries[neighbor_index[row, :k]],
+            "거리": neighbor_dist[row, :k],
+        })
+
+        with stage("figure: 비슷한 국가"):
+            fig3 = px.bar(similar, x="Country", y="거리", text="거리", color_discrete_sequence=["#4a90d9"])
+            fig3.update_traces(texttemplate="%{text:.3f}", textposition="outside")
+            fig3.update_layout(
+                title=f"🤝 {base_country}와 MBTI 분포가 비슷한 {k}개국 ({METRICS[metric]}, 작을수록 비슷)",
+                xaxis_title="국가",
+                yaxis_title=METRICS[metric],
+                showlegend=False,
+                plot_bgcolor="white",
+            )
+        with stage("plotly_chart"):
+            st.plotly_chart(fig3, use_container_width=True)
+
+        st.markdown("#### 🧩 분포가 비슷한 국가끼리 묶기 (k-means)")
+        max_clusters = min(MAX_CLUSTERS, len(matrix.countries))
+        n_clusters = st.slider("군집 수", 2, max_clusters, min(5, max_clusters))
+        labels = load_clusters(matrix.digest, n_clusters, matrix)
+        coords = load_pca(matrix.digest, matrix)
+
+        cluster_df = pd.DataFrame({
+            "Country": matrix.countries,
+            "군집": [f"군집 {label + 1}" for label in labels],
+            "주성분 1": coords[:, 0],
+            "주성분 2": coords[:, 1],
+        })
+        with stage("figure: 군집 산점도"):
+            fig4 = px.scatter(
+                cluster_df, x="주성분 1", y="주성분 2", color="군집", hover_name="Country",
+                category_orders={"군집": [f"군집 {i + 1}" for i in range(n_clusters)]},
+            )
+            fig4.add_annotation(
+                x=coords[row, 0], y=coords[row, 1], text=base_country, showarrow=True, arrowcolor="red",
+            )
+            fig4.update_layout(title="🧩 국가별 MBTI 분포 군집 (2차원 주성분)", plot_bgcolor="white")
+        with stage("plotly_chart"):
+            st.plotly_chart(fig4, use_container_width=True)
+
+        same_cluster = cluster_df.loc[labels == labels[row], "Country"]
+        st.write(f"**{base_country}**와 같은 군집(군집 {labels[row] + 1})의 국가 {len(same_cluster)}개: " + ", ".join(same_cluster))
+
+debug_panel()
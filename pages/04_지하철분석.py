@@ -1,68 +1,203 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
 import plotly.express as px
 
-st.set_page_config(page_title="지하철 승하차 분석", layout="wide")
-
-st.title("🚇 서울 지하철 승·하차 분석 (2025년 10월)")
-
-# 데이터 불러오기 (CSV는 루트 폴더에 위치)
-@st.cache_data
-def load_data():
-    return pd.read_csv("bongsuuun.csv", encoding="cp949")
-
-df = load_data()
-
-# 날짜 선택 (2025년 10월)
-df['사용일자'] = df['사용일자'].astype(str)
-unique_dates = sorted(df['사용일자'].unique())
-unique_dates = [d for d in unique_dates if d.startswith("202510")]
-
-selected_date = st.selectbox("📅 날짜 선택", unique_dates)
-
-# 호선 선택
-lines = sorted(df["노선명"].unique())
-selected_line = st.selectbox("🚉 호선 선택", lines)
-
-# 선택 필터 적용
-filtered = df[(df["사용일자"] == selected_date) & (df["노선명"] == selected_line)].copy()
-
-# 승하차 합계 계산
-filtered["승하차합계"] = filtered["승차총승객수"] + filtered["하차총승객수"]
+from core.instrument import debug_panel, stage, start_run, tracked
+from subway_data import SubwayStore, build_station_index, group_by_month, source_files
+from subway_analysis import DAY_TYPES, daily_line_totals, line_totals, station_totals
+from subway_charts import build_station_figure
+from subway_maps import HEAT_METRICS, create_heatmap, station_grid
 
-# 가장 큰 순서대로 정렬
-filtered = filtered.sort_values("승하차합계", ascending=False)
-
-# Plotly용 색상 생성
-top_station = filtered.iloc[0]["역명"]
-
-# 파란색 → 밝은 파란색 그라데이션
-blue_colors = px.colors.sequential.Blues[::-1]  # 진한 → 옅은 순서로 변환
-
-# 1등 빨간색 + 나머지 그라데이션 매핑
-colors = ["red"] + blue_colors[: len(filtered) - 1]
-
-# 그래프 생성
-fig = go.Figure()
-
-fig.add_trace(go.Bar(
-    x=filtered["역명"],
-    y=filtered["승하차합계"],
-    marker=dict(color=colors),
-    text=filtered["승하차합계"],
-    textposition='outside'
-))
-
-fig.update_layout(
-    title=f"📊 {selected_date} / {selected_line} 승·하차 합계 TOP 역",
-    xaxis_title="역명",
-    yaxis_title="승·하차 합계",
-    template="plotly_white",
-    height=600
-)
-
-st.plotly_chart(fig, use_container_width=True)
+st.set_page_config(page_title="지하철 승하차 분석", layout="wide")
 
-st.write("### 데이터 미리보기")
-st.dataframe(filtered)
+start_run("04_지하철분석")
+
+st.title("🚇 서울 지하철 승·하차 분석")
+
+# 데이터 불러오기 (루트의 CSV + data/subway 폴더의 월별 CSV를 날짜별 Parquet 저장소로 적재)
+# 저장소는 프로세스당 하나를 공유하고, 재실행마다 새로 들어온 날짜만 읽어서 추가합니다.
+@tracked(st.cache_resource)
+def load_store():
+    return SubwayStore()
+
+store = load_store()
+with stage("ingest"):
+    store.refresh(source_files())
+dates_by_month = group_by_month(store.dates())
+
+if not dates_by_month:
+    st.error("불러올 승하차 데이터가 없습니다. bongsuuun.csv 또는 data/subway 폴더를 확인하세요.")
+    debug_panel()
+    st.stop()
+
+# 아래 캐시는 데이터 버전 대신 날짜(기간)별 내용 토큰을 키로 써서,
+# 새 날짜가 추가돼도 그 날짜가 포함된 결과만 다시 계산합니다.
+
+# 하루치 (날짜, 호선)별 역 합계 표를 미리 만들어 두고 선택 시에는 조회만 합니다.
+@tracked(st.cache_resource)
+def load_day_index(date, token):
+    return build_station_index(load_store().day(date))
+
+# (날짜, 호선, N)별로 완성된 Figure 객체를 캐시해서 선택이 바뀔 때 다시 그리지 않습니다.
+# (JSON으로 캐시하면 st.plotly_chart가 매번 dict 전체를 다시 검증하므로 객체를 그대로 넘김)
+# 모든 세션이 같은 객체를 공유하므로 읽기만 하고 수정하지 않습니다.
+@tracked(st.cache_resource)
+def load_station_figure(token, date, line, top_n):
+    frame = load_day_index(date, token)[(date, line)]
+    title = f"📊 {date} / {line} 승·하차 합계 TOP {min(top_n, len(frame))} 역"
+    return build_station_figure(frame, title, top_n)
+
+# 기간·호선 조건별 집계는 조건마다 한 번만 계산해서 캐시합니다.
+@tracked(st.cache_data)
+def query_station_totals(token, start, end, lines, day_type, top_n, merge_lines):
+    return station_totals(load_store().frame(start, end), start, end, list(lines), day_type, top_n, merge_lines)
+
+@tracked(st.cache_data)
+def query_daily_line_totals(token, start, end, lines, day_type):
+    return daily_line_totals(load_store().frame(start, end), start, end, list(lines), day_type)
+
+@tracked(st.cache_data)
+def query_line_totals(token, start, end, lines, day_type):
+    return line_totals(load_store().frame(start, end), start, end, list(lines), day_type)
+
+# 날짜별 히트맵 점(격자 칸별 가중치)도 그 날짜 토큰으로 캐시해서 날짜를 넘겨 볼 때 바로 그립니다.
+@tracked(st.cache_data)
+def heat_points(token, date, metric):
+    return station_grid().heat_points(load_store().day(date), metric)
+
+def to_yyyymmdd(d):
+    return d.year * 10000 + d.month * 100 + d.day
+
+lines = store.lines()
+
+tab_daily, tab_range, tab_map = st.tabs(["📊 날짜·호선별 보기", "📈 기간·호선 비교", "🗺️ 역별 히트맵"])
+
+# ==========================
+# 1️⃣ 날짜·호선별 보기
+# ==========================
+with tab_daily:
+    # 월 선택 (데이터에 있는 달을 자동으로 표시, 최신 달이 기본값)
+    months = sorted(dates_by_month)
+    selected_month = st.selectbox(
+        "🗓️ 월 선택", months, index=len(months) - 1,
+        format_func=lambda m: f"{m // 100}년 {m % 100}월",
+    )
+
+    # 날짜 선택 (사용일자는 YYYYMMDD 정수)
+    selected_date = st.selectbox("📅 날짜 선택", dates_by_month[selected_month], format_func=str)
+
+    # 호선 선택
+    selected_line = st.selectbox("🚉 호선 선택", lines)
+
+    # 선택한 날짜·호선의 역 목록 (승하차합계 내림차순으로 이미 정렬되어 있음)
+    day_token = store.token(int(selected_date))
+    filtered = load_day_index(int(selected_date), day_token).get((int(selected_date), selected_line))
+
+    # 표시할 상위 역 개수 (나머지 역은 '기타' 막대 하나로 합침)
+    daily_top_n = st.slider("🔝 표시할 상위 역 개수", 5, 50, 15)
+
+    if filtered is None:
+        st.warning("선택한 날짜에 해당 호선의 데이터가 없습니다.")
+    else:
+        fig = load_station_figure(day_token, int(selected_date), selected_line, daily_top_n)
+        with stage("plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
+
+        st.write(f"### 데이터 미리보기 (상위 {min(daily_top_n, len(filtered))}개 역 / 전체 {len(filtered)}개 역)")
+        st.dataframe(filtered.head(daily_top_n))
+
+# ==========================
+# 2️⃣ 기간·호선 비교
+# ==========================
+with tab_range:
+    all_dates = [d for month in sorted(dates_by_month) for d in dates_by_month[month]]
+    first_day = pd.to_datetime(str(all_dates[0])).date()
+    last_day = pd.to_datetime(str(all_dates[-1])).date()
+
+    period = st.date_input(
+        "📅 기간 선택", (first_day, last_day),
+        min_value=first_day, max_value=last_day,
+    )
+    # 시작일만 고른 상태에서는 하루짜리 기간으로 처리
+    start_day, end_day = (period[0], period[-1]) if isinstance(period, (tuple, list)) else (period, period)
+
+    default_lines = [line for line in lines if line in {f"{i}호선" for i in range(1, 10)}]
+    selected_lines = st.multiselect("🚉 호선 선택 (비우면 전체)", lines, default=default_lines)
+    day_type = st.radio("요일 구분", DAY_TYPES, horizontal=True)
+    col1, col2 = st.columns(2)
+    top_n = col1.slider("상위 역 개수", 5, 50, 20)
+    merge_lines = col2.checkbox("환승역은 호선 구분 없이 합치기", value=False)
+
+    start, end = to_yyyymmdd(start_day), to_yyyymmdd(end_day)
+    query = (store.range_token(start, end), start, end, tuple(selected_lines), day_type)
+    top_stations = query_station_totals(*query, top_n, merge_lines)
+
+    if top_stations.empty:
+        st.warning("선택한 조건에 해당하는 데이터가 없습니다.")
+    else:
+        with stage("figure: 상위 역"):
+            fig_top = px.bar(
+                top_stations,
+                x="표시명",
+                y="승하차합계",
+                color=None if merge_lines else "노선명",
+                text="승하차합계",
+                title=f"📊 {start_day} ~ {end_day} ({day_type}) 승·하차 합계 상위 {top_n}개 역",
+            )
+            fig_top.update_traces(texttemplate="%{text:,}", textposition="outside")
+            fig_top.update_layout(
+                xaxis_title="역명", yaxis_title="승·하차 합계",
+                template="plotly_white", height=600,
+                xaxis=dict(categoryorder="total descending"),
+            )
+        with stage("plotly_chart"):
+            st.plotly_chart(fig_top, use_container_width=True)
+
+        with stage("figure: 날짜별 추이"):
+            fig_daily = px.line(
+                query_daily_line_totals(*query),
+                x="날짜", y="승하차합계", color="노선명", markers=True,
+                title="📈 날짜별 호선 승·하차 합계",
+            )
+            fig_daily.update_layout(yaxis_title="승·하차 합계", template="plotly_white")
+        with stage("plotly_chart"):
+            st.plotly_chart(fig_daily, use_container_width=True)
+
+        st.write("### 호선별 합계")
+        st.dataframe(query_line_totals(*query), hide_index=True)
+
+# ==========================
+# 3️⃣ 역별 히트맵
+# ==========================
+# 날짜를 바꿀 때 이 영역만 다시 실행합니다. st.tabs는 모든 탭을 매번 실행하므로
+# 지도는 켰을 때만 만들어서 다른 탭의 선택을 바꿀 때 지도를 다시 보내지 않습니다.
+@st.fragment
+def heatmap_section():
+    from streamlit_folium import st_folium
+
+    dates = store.dates()
+    heat_date = st.select_slider(
+        "📅 날짜 (좌우로 넘겨 보기)", dates, value=dates[-1],
+        format_func=lambda d: f"{d // 10000}.{d // 100 % 100:02d}.{d % 100:02d}",
+    )
+    metric = st.radio("표시할 인원", list(HEAT_METRICS), horizontal=True)
+    points, peak, missing = heat_points(store.token(heat_date), heat_date, metric)
+
+    st.caption(
+        f"역 좌표를 {station_grid().cell_km}km 격자로 묶어 합친 {metric} 인원입니다. "
+        f"가장 붐빈 칸: {peak:,}명 (색은 그날 가장 붐빈 칸 기준)"
+    )
+    if missing:
+        st.caption(f"좌표가 없어 빠진 역 {len(missing)}곳: {', '.join(missing[:10])}{' …' if len(missing) > 10 else ''}")
+    if not st.toggle("🗺️ 히트맵 지도 보기", key="subway_heatmap_on"):
+        st.info("지도를 켜면 선택한 날짜의 역별 히트맵을 그립니다.")
+        return
+    with stage("folium map build"):
+        heat_map = create_heatmap(points)
+    with stage("st_folium"):
+        st_folium(heat_map, width=1000, height=600, returned_objects=[], key="subway_heatmap")
+
+with tab_map:
+    heatmap_section()
+
+debug_panel()
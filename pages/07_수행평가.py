@@ -1,151 +1,216 @@
 import streamlit as st
-import pandas as pd
-import folium
-from folium.plugins import MarkerCluster
-import matplotlib.colors as mcolors
-import geopy
-from geopy.geocoders import Nominatim
-from geopy.extra.rate_limiter import RateLimiter
+
+import fire_data
+from core import lazy_import
+from core.instrument import count, debug_panel, stage, start_run, tracked
+from fire_maps import (
+    FAST_MARKER_THRESHOLD,
+    create_district_map,
+    create_fast_map,
+    create_folium_map,
+)
+from gazetteer import locate_districts
+from geocache import GeocodeCache, GeocodeJob, GeocodeJobs
 
 # -----------------
 # 1. 설정 및 데이터 로드
 # -----------------
 st.set_page_config(layout="wide", page_title="연간 화재 통계 분석")
+
+start_run("07_수행평가")
 st.title("🔥 연간 화재 통계 (재산피해 기준)")
 st.caption("소방청_연간화재통계_20241231.csv 분석 결과")
 
-@st.cache_data
-def load_data(file_path):
-    """CSV 파일을 로드하고 초기 데이터 처리를 수행합니다."""
-    # 파일 경로가 사용자가 올린 파일의 contentFetchId에 해당함
-    df = pd.read_csv(file_path, encoding='utf-8')
-    # NaN은 '미상'으로 처리하여 문자열 결합에 문제가 없도록 합니다.
-    df['시_군_구'] = df['시_군_구'].fillna('미상')
-    # 지오코딩을 위한 주소 컬럼 생성
-    df['full_address'] = df['시도'] + ' ' + df['시_군_구']
-    # '인명피해(명)소계', '사망', '부상' 컬럼은 0으로 표기되어 있어 제외하거나 필요 시 활용
-    
-    # Folium 시각화를 위해 재산피해소계가 큰 순서로 정렬하고 상위 100개만 사용
-    # *참고: 스트림릿 클라우드 환경에서 지오코딩은 API 호출 제한 및 실행 시간 문제로 전체 데이터 처리 시 비효율적입니다.
-    # 따라서 재산피해 상위 100건만 시각화합니다.
-    df_top = df.sort_values(by='재산피해소계', ascending=False).head(100).reset_index(drop=True)
-    return df_top
+# 온라인 지오코더는 Nominatim을 고른 뒤에만 필요하므로 처음 쓸 때 불러옵니다.
+geocoders = lazy_import("geopy.geocoders")
+rate_limiter = lazy_import("geopy.extra.rate_limiter")
+
+@tracked(st.cache_data)
+def load_data(file_path, top_n=100):
+    """CSV 파일을 로드하고 초기 데이터 처리를 수행합니다 (top_n=None이면 전체)."""
+    return fire_data.load_data(file_path, top_n)
 
 # -----------------
 # 2. 지오코딩 함수
 # -----------------
 
-@st.cache_data
-def geocode_data(df):
-    """주소 정보를 위도, 경도로 변환합니다."""
+# 사전에 없는 주소를 조회할 지오코더
+def make_geocoder():
     # Nominatim geolocator 초기화
-    geolocator = Nominatim(user_agent="fire_analysis_app")
-    
+    geolocator = geocoders.Nominatim(user_agent="fire_analysis_app")
     # RateLimiter를 사용하여 쿼리 간 지연시간 설정 (과도한 API 호출 방지)
-    geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1.5, max_retries=3)
-    
-    st.info("⚠️ **지오코딩 진행 중**: 재산피해 상위 100건의 주소 정보를 위도/경도로 변환하는 중입니다. (약 2~3분 소요)")
-    
-    # 주소에 대한 위도/경도 정보를 새로운 컬럼에 저장
-    location_data = df['full_address'].apply(geocode)
+    # 오류는 GeocodeJob에서 처리해 실패한 주소가 캐시에 남지 않도록 합니다.
+    return rate_limiter.RateLimiter(geolocator.geocode, min_delay_seconds=1.5, max_retries=3, swallow_exceptions=False)
+
+@tracked(st.cache_data)
+def geocode_offline(df):
+    """오프라인 행정구역 사전(data/korea_districts.csv)으로 위도, 경도를 채웁니다 (없으면 NaN)."""
+    df = df.copy()
+    df[['Latitude', 'Longitude']] = locate_districts(df)
+    return df
+
+@st.cache_resource
+def geocode_jobs():
+    """재실행 사이에도 유지되는 백그라운드 지오코딩 작업 목록 {주소들: GeocodeJob}."""
+    return GeocodeJobs()
+
+def start_geocode_job(addresses, restart=False):
+    """같은 주소 목록의 작업이 있으면 그대로 쓰고 (취소된 작업도), 없으면 새로 시작합니다.
+
+    restart=True(지도 시각화 시작 버튼을 다시 누름)이면 취소되었거나 오류 난
+    주소가 있는 작업을 다시 돌립니다. 이 세션의 작업 key는 session_state에 둡니다.
+    """
+    key = tuple(sorted(addresses))
+    st.session_state['fire_geocode_key'] = key
+    return geocode_jobs().start(
+        key, lambda: GeocodeJob(addresses, make_geocoder(), GeocodeCache()), restart=restart
+    )
+
+def session_geocode_job():
+    """이 세션이 마지막으로 띄운 지오코딩 작업 (없으면 None)."""
+    key = st.session_state.get('fire_geocode_key')
+    return None if key is None else geocode_jobs().get(key)
+
+@stage("geocode_data")
+def geocode_data(df, restart=False):
+    """주소 정보를 위도, 경도로 변환합니다.
+
+    먼저 오프라인 행정구역 사전에서 찾고, 사전에 없는 주소만 백그라운드 작업으로
+    조회합니다 (디스크 캐시에 없는 주소만). (지금까지 찾은 결과, 작업)을 돌려주며,
+    모두 사전에서 찾았으면 작업은 None입니다.
+    """
+    df = geocode_offline(df)
     
-    df['Latitude'] = location_data.apply(lambda loc: loc.latitude if loc else None)
-    df['Longitude'] = location_data.apply(lambda loc: loc.longitude if loc else None)
+    missing = df['Latitude'].isna()
+    job = None
+    if not missing.any():
+        st.session_state.pop('fire_geocode_key', None)
+    else:
+        # 같은 주소(시도 + 시_군_구)는 한 번만 조회합니다.
+        job = start_geocode_job(df.loc[missing, 'full_address'].unique(), restart)
+        coords = job.results()
+        df = df.copy()
+        df.loc[missing, 'Latitude'] = df.loc[missing, 'full_address'].map(lambda address: coords.get(address, (None, None))[0]).astype(float)
+        df.loc[missing, 'Longitude'] = df.loc[missing, 'full_address'].map(lambda address: coords.get(address, (None, None))[1]).astype(float)
     
     # 유효한 좌표만 남기기
     df_geo = df.dropna(subset=['Latitude', 'Longitude'])
-    st.success(f"지오코딩 완료: 유효한 위치 정보 {len(df_geo)}건")
-    return df_geo
+    return df_geo, job
 
 # -----------------
-# 3. Folium 지도 생성 함수
+# 2-1. 시·군·구별 집계 함수
 # -----------------
 
-def create_folium_map(df_geo):
-    """Folium 지도를 생성하고 마커를 추가합니다."""
-    
-    # 지도 중심 설정 (대한민국 중앙 부근)
-    map_center = [35.907757, 127.766922] 
-    
-    # Folium 지도 객체 생성
-    m = folium.Map(location=map_center, zoom_start=7, tiles="cartodbdarkmatter")
-    
-    # MarkerCluster 플러그인 사용 (마커가 겹칠 때 그룹화)
-    marker_cluster = MarkerCluster().add_to(m)
-    
-    # 재산피해소계의 최소/최대값으로 크기 및 색상 스케일 정의
-    max_damage = df_geo['재산피해소계'].max()
-    min_damage = df_geo['재산피해소계'].min()
-    
-    # 재산피해 규모에 따른 색상 스케일 (예: 노랑 -> 빨강)
-    cmap = mcolors.LinearSegmentedColormap.from_list("damage_scale", ["#FFFF00", "#FF0000"])
-    
-    for _, row in df_geo.iterrows():
-        lat = row['Latitude']
-        lon = row['Longitude']
-        damage = row['재산피해소계']
-        
-        # 재산피해에 비례하는 반지름 계산 (시각적 효과를 위해 로그 스케일 및 상수 곱 적용)
-        # 1000만원 = 1, 10억원 = 1000
-        radius_scale = 0.00001
-        radius = (damage * radius_scale) ** 0.5 + 5  # 기본 크기 5 추가
-        
-        # 피해액에 따른 색상 결정 (정규화 후 색상 매핑)
-        if max_damage > min_damage:
-             normalized_damage = (damage - min_damage) / (max_damage - min_damage)
-        else:
-             normalized_damage = 1
-             
-        color_rgb = cmap(normalized_damage)
-        color_hex = mcolors.rgb2hex(color_rgb)
-        
-        # 팝업 정보
-        popup_html = f"""
-        <b>장소:</b> {row['full_address']}<br>
-        <b>피해액:</b> {damage:,.0f} 원<br>
-        <b>발화요인:</b> {row['발화요인대분류']} / {row['발화요인소분류']}<br>
-        <b>최초착화물:</b> {row['최초착화물소분류']}
-        """
-
-        # CircleMarker (원형 마커) 추가
-        folium.CircleMarker(
-            location=(lat, lon),
-            radius=radius,
-            color=color_hex,
-            fill=True,
-            fill_color=color_hex,
-            fill_opacity=0.7,
-            popup=popup_html
-        ).add_to(marker_cluster)
-        
-    return m
+@tracked(st.cache_data)
+def aggregate_by_district(df):
+    """전체 화재 데이터를 시·군·구별로 집계합니다 (건수, 피해 합계/평균, 주요 발화요인)."""
+    return fire_data.aggregate_by_district(df)
+
+# -----------------
+# 3. Folium 지도 생성 함수
+# -----------------
+# fire_maps.py 의 create_folium_map, create_fast_map, create_district_map 사용
 
 # -----------------
 # 4. Streamlit 실행 로직
 # -----------------
 
 if __name__ == "__main__":
-    # 데이터 로드
-    df_top = load_data("소방청_연간화재통계_20241231.csv")
+    file_path = fire_data.FIRE_CSV
+    
+    # 지도 방식 선택: 시·군·구별 집계는 전체 데이터를 사용하고 마커 수는 행정구역 수로 제한됩니다.
+    map_mode = st.radio(
+        "지도 방식",
+        ["🏙️ 시·군·구별 집계 (전체 데이터)", "📍 개별 화재 위치"],
+        horizontal=True,
+    )
+    by_district = map_mode.startswith("🏙️")
+    
+    # 데이터 로드 (지오코딩이 오프라인이므로 전체 데이터도 선택 가능)
+    if by_district:
+        show_all = True
+    else:
+        col_all, col_k = st.columns([1, 2])
+        show_all = col_all.checkbox("전체 화재 건수 표시", value=False)
+        # 상위 k건만 남기며 읽으므로 k가 작을수록 메모리를 적게 씁니다.
+        top_k = col_k.number_input("재산피해 상위 건수", min_value=10, max_value=100_000,
+                                   value=100, step=100, disabled=show_all)
+    df_top = load_data(file_path, top_n=None if show_all else int(top_k))
     
     # 데이터 요약 정보 표시
-    st.subheader("📊 재산피해 상위 100건 데이터 정보")
+    st.subheader(f"📊 {'전체' if show_all else f'재산피해 상위 {int(top_k):,}건'} 데이터 정보 ({len(df_top):,}건)")
     st.write(f"최대 재산 피해액: **{df_top['재산피해소계'].max():,.0f}** 원")
     st.dataframe(df_top.head(5))
 
-    # 지오코딩 및 지도 생성
-    if st.button("🗺️ 지도 시각화 시작 (지오코딩 필요)"):
-        df_geo = geocode_data(df_top)
+    # 지오코딩 및 지도 생성 (한 번 시작하면 다른 위젯을 바꿔도 지도가 유지됨)
+    if st.button("🗺️ 지도 시각화 시작"):
+        st.session_state['show_fire_map'] = True
+        # 다시 누르면 취소했거나 오류가 난 지오코딩을 이어서 다시 조회
+        st.session_state['fire_geocode_restart'] = True
+    
+    def show_map():
+        from streamlit_folium import st_folium
+        
+        restart = st.session_state.pop('fire_geocode_restart', False)
+        if by_district:
+            df_geo, job = geocode_data(aggregate_by_district(df_top), restart)
+        else:
+            df_geo, job = geocode_data(df_top, restart)
+        
+        # 백그라운드 지오코딩 진행 상황 (찾은 위치는 바로 지도에 반영)
+        if job is not None and job.running:
+            st.progress(job.progress, text=f"⚠️ **지오코딩 진행 중**: 사전에 없는 주소 {job.finished}/{job.total}곳 처리")
+            if st.button("⏹️ 지오코딩 취소"):
+                job.cancel()
+        elif job is not None and job.cancelled and job.finished < job.total:
+            st.warning(f"지오코딩이 취소되었습니다: 주소 {job.finished}/{job.total}곳만 처리했습니다. "
+                       "'🗺️ 지도 시각화 시작'을 다시 누르면 나머지를 조회합니다.")
+        else:
+            st.success(f"지오코딩 완료: 유효한 위치 정보 {len(df_geo)}건")
+            if job is not None and job.failed:
+                st.warning(f"조회 중 오류가 난 주소 {len(job.failed)}곳은 '🗺️ 지도 시각화 시작'을 다시 누르면 다시 조회합니다.")
         
         # 유효한 데이터가 있을 경우 지도 표시
-        if not df_geo.empty:
+        if df_geo.empty:
+            if job is None or not job.running:
+                st.error("지오코딩에 실패하여 지도에 표시할 유효한 위치 정보가 없습니다.")
+        elif by_district:
+            st.subheader("🌐 시·군·구별 화재 통계 Folium 지도")
+            st.markdown("마커의 **크기**는 **화재 건수**, **색상(노랑 → 빨강)**은 **재산피해 합계**에 비례하며, 마커를 클릭하면 건당 평균 피해와 주요 발화요인을 볼 수 있습니다.")
+            
+            with stage("folium map build"):
+                folium_map = create_district_map(df_geo)
+            count("markers", len(df_geo))
+            with stage("st_folium"):
+                st_folium(folium_map, width=1000, height=700)
+            st.dataframe(df_geo.drop(columns=['full_address', 'Latitude', 'Longitude']))
+        else:
             st.subheader("🌐 재산피해 규모별 Folium 지도")
             st.markdown("마커의 **크기**와 **색상(노랑 → 빨강)**은 **재산피해소계**에 비례하며, 마커를 클릭하면 상세 정보를 볼 수 있습니다.")
             
-            folium_map = create_folium_map(df_geo)
+            # 건수가 많으면 브라우저 쪽 렌더링(FastMarkerCluster)을 사용
+            with stage("folium map build"):
+                if len(df_geo) > FAST_MARKER_THRESHOLD:
+                    st.caption(f"화재 {len(df_geo):,}건을 빠른 렌더링 모드(FastMarkerCluster)로 표시합니다.")
+                    folium_map = create_fast_map(df_geo)
+                else:
+                    folium_map = create_folium_map(df_geo)
+            count("markers", len(df_geo))
             
             # Streamlit에 Folium 지도 표시
-            from streamlit_folium import st_folium
-            st_folium(folium_map, width=1000, height=700)
-        else:
-            st.error("지오코딩에 실패하여 지도에 표시할 유효한 위치 정보가 없습니다.")
+            with stage("st_folium"):
+                st_folium(folium_map, width=1000, height=700)
+        
+        # 작업이 시작되거나 끝나면 한 번 전체를 다시 실행해서 자동 새로고침을 켜고 끔
+        current = session_geocode_job()
+        if (current is not None and current.running) != st.session_state.get('fire_map_polling', False):
+            st.rerun()
+    
+    if st.session_state.get('show_fire_map'):
+        # 이 세션의 지오코딩 작업이 진행 중이면 지도 영역만 2초마다 다시 그려 중간 결과를 보여줌
+        job = session_geocode_job()
+        polling = job is not None and job.running
+        st.session_state['fire_map_polling'] = polling
+        st.fragment(show_map, run_every=2 if polling else None)()
+    
+    debug_panel()
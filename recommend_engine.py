@@ -0,0 +1,146 @@
+"""MBTI 네 축 가중치로 진로 · 책 · 영화 점수를 매기는 추천 엔진.
+
+항목마다 붙은 (EI, SN, TF, JP) 가중치를 모아 항목 수 × 4 행렬을 만들고,
+사용자 성향도 같은 4차원 벡터로 바꿔서 행렬 곱 한 번으로 모든 항목의 점수를
+구합니다. 모르는 축은 '?'로 쓰면 0이 되므로 'IN?J'처럼 일부만 알아도 되고,
+축마다 -1 ~ 1 사이 값을 주면 "조금 외향적" 같은 애매한 성향도 표현할 수 있습니다.
+16유형의 순위는 엔진을 만들 때 한꺼번에 계산해 두어서 유형을 고를 때는
+조회만 합니다.
+"""
+import os
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+
+from recommendations import AXES, MBTI_TYPES, RECOMMENDATIONS_JSON, load_store
+
+# 축별 (앞 글자 = +1, 뒤 글자 = -1)
+AXIS_LETTERS = [("E", "I"), ("S", "N"), ("T", "F"), ("J", "P")]
+
+# 모르는 축을 나타내는 글자
+UNKNOWN_LETTERS = "?X_-"
+
+# 유형별로 미리 저장해 두는 순위 길이
+PRECOMPUTED = 50
+
+
+def type_vector(mbti):
+    """'INTJ' → [-1, -1, 1, 1]. 모르는 축('?', 'X')은 0 (예: 'IN?J')."""
+    text = str(mbti).strip().upper()
+    if len(text) != len(AXIS_LETTERS):
+        raise ValueError(f"MBTI는 네 글자여야 합니다: {mbti!r}")
+    vector = np.zeros(len(AXIS_LETTERS), dtype=np.float32)
+    for i, (letter, (first, second)) in enumerate(zip(text, AXIS_LETTERS)):
+        if letter == first:
+            vector[i] = 1.0
+        elif letter == second:
+            vector[i] = -1.0
+        elif letter not in UNKNOWN_LETTERS:
+            raise ValueError(f"{i + 1}번째 글자는 {first}, {second}, ? 중 하나여야 합니다: {mbti!r}")
+    return vector
+
+
+def user_vector(user):
+    """MBTI 문자열이나 축별 값 4개를 -1 ~ 1 범위의 성향 벡터로 바꿉니다."""
+    if isinstance(user, str):
+        return type_vector(user)
+    vector = np.asarray(user, dtype=np.float32).reshape(-1)
+    if vector.shape != (len(AXES),):
+        raise ValueError(f"축별 값은 {len(AXES)}개여야 합니다 ({', '.join(AXES)}).")
+    return np.clip(vector, -1.0, 1.0)
+
+
+def _ordered(indices, scores):
+    """점수 내림차순, 같은 점수면 목록 순서대로 정렬한 (번호, 점수)."""
+    order = np.lexsort((indices, -scores))
+    return indices[order], scores[order]
+
+
+class ScoredCatalog:
+    """가중치가 붙은 추천 항목 목록과 미리 계산한 16유형 순위."""
+
+    def __init__(self, items, precompute=PRECOMPUTED):
+        self.items = tuple(items)
+        self.weights = np.array(
+            [[item["axes"][axis] for axis in AXES] for item in self.items], dtype=np.float32
+        ).reshape(-1, len(AXES))
+        self._types = np.array([item.get("mbti") for item in self.items], dtype=object)
+
+        # 16유형 점수를 한 번에 (항목 수 × 16), 유형마다 상위 precompute개 순위 저장
+        types = np.stack([type_vector(mbti) for mbti in MBTI_TYPES])
+        scores = self.weights @ types.T
+        order = np.argsort(-scores, axis=0, kind="stable")[:precompute].T
+        self._precomputed = {
+            mbti: (order[j], scores[order[j], j]) for j, mbti in enumerate(MBTI_TYPES)
+        }
+
+    def __len__(self):
+        return len(self.items)
+
+    def scores(self, user):
+        """모든 항목의 점수 (가중치 · 성향 벡터)."""
+        return self.weights @ user_vector(user)
+
+    def rank(self, user, k):
+        """점수가 높은 k개 항목의 (번호 배열, 점수 배열)."""
+        k = max(0, min(k, len(self.items)))
+        key = user.strip().upper() if isinstance(user, str) else None
+        if key in self._precomputed and k <= len(self._precomputed[key][0]):
+            indices, scores = self._precomputed[key]
+            return indices[:k], scores[:k]
+
+        scores = self.scores(user)
+        if k == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        candidates = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        # 경계에서 같은 점수가 여럿이면 목록 앞쪽 항목이 들어오도록 한 번 더 모음
+        threshold = scores[candidates].min()
+        candidates = np.union1d(candidates[scores[candidates] > threshold], np.flatnonzero(scores == threshold))
+        indices, ranked = _ordered(candidates, scores[candidates])
+        return indices[:k], ranked[:k]
+
+    def best_type(self, user):
+        """가장 잘 맞는 항목의 유형. 다른 유형 항목도 같은 점수면 정할 수 없으므로 None."""
+        if not self.items:
+            return None
+        scores = self.scores(user)
+        top = int(np.argmax(scores))
+        others = scores[self._types != self._types[top]]
+        if len(others) and others.max() >= scores[top]:
+            return None
+        return self._types[top]
+
+    def recommend(self, user, k):
+        """[(항목, 일치도 0 ~ 1), ...] 일치도는 알고 있는 축 기준으로 환산한 값."""
+        indices, scores = self.rank(user, k)
+        scale = float(np.abs(user_vector(user)).sum())
+        matches = (scores / scale + 1) / 2 if scale > 0 else np.full(len(scores), 0.5)
+        return [(self.items[i], float(m)) for i, m in zip(indices, matches)]
+
+
+def _career_items(store):
+    for mbti in MBTI_TYPES:
+        for item in store["careers"][mbti]:
+            yield dict(item, mbti=mbti)
+
+
+def _media_items(store, kind):
+    for mbti in MBTI_TYPES:
+        for item in store["media"][mbti][kind]:
+            yield dict(item, mbti=mbti)
+
+
+@lru_cache(maxsize=4)
+def _build(path, mtime_ns):
+    store = load_store(path)
+    return MappingProxyType({
+        "careers": ScoredCatalog(_career_items(store)),
+        "books": ScoredCatalog(_media_items(store, "books")),
+        "movies": ScoredCatalog(_media_items(store, "movies")),
+    })
+
+
+def load_engines(path=RECOMMENDATIONS_JSON):
+    """{'careers', 'books', 'movies'} → ScoredCatalog (파일이 바뀔 때만 다시 만듦)."""
+    return _build(str(path), os.stat(path).st_mtime_ns)
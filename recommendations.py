@@ -0,0 +1,111 @@
+"""MBTI별 진로 · 책 · 영화 추천 데이터 저장소.
+
+추천 목록은 data/recommendations.json 한 파일에 버전과 함께 보관하고,
+프로세스마다 한 번만 읽어서 검증한 뒤 수정할 수 없는(읽기 전용) 형태로
+돌려줍니다. 파일이 바뀌면(수정 시각 기준) 다시 읽습니다.
+
+버전 2부터 진로 · 책 · 영화 항목마다 네 축(EI, SN, TF, JP)의 성향 가중치
+"axes"가 붙습니다. 값은 -1 ~ 1이고 양수는 앞 글자(E, S, T, J), 음수는 뒤
+글자(I, N, F, P) 쪽으로 잘 맞는다는 뜻입니다.
+"""
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+
+RECOMMENDATIONS_JSON = Path("data") / "recommendations.json"
+SCHEMA_VERSION = 2
+
+# axes 가중치의 축 순서 (양수 = 앞 글자, 음수 = 뒤 글자)
+AXES = ["EI", "SN", "TF", "JP"]
+
+MBTI_TYPES = [
+    "ISTJ", "ISFJ", "INFJ", "INTJ",
+    "ISTP", "ISFP", "INFP", "INTP",
+    "ESTP", "ESFP", "ENFP", "ENTP",
+    "ESTJ", "ESFJ", "ENFJ", "ENTJ",
+]
+
+
+class RecommendationSchemaError(ValueError):
+    """추천 데이터 파일의 형식이 잘못되었을 때 발생합니다."""
+
+
+def _require(condition, message):
+    if not condition:
+        raise RecommendationSchemaError(message)
+
+
+def _is_str_list(value):
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+
+def _check_axes(value, where):
+    _require(isinstance(value, dict) and set(value) == set(AXES),
+             f"{where}.axes는 {', '.join(AXES)} 네 축을 가진 객체여야 합니다.")
+    for axis in AXES:
+        weight = value[axis]
+        _require(isinstance(weight, (int, float)) and not isinstance(weight, bool) and -1 <= weight <= 1,
+                 f"{where}.axes.{axis}는 -1 ~ 1 사이 숫자여야 합니다.")
+
+
+def _check_titles(value, where):
+    _require(isinstance(value, list), f"{where}는 목록이어야 합니다.")
+    for i, item in enumerate(value):
+        _require(isinstance(item, dict) and isinstance(item.get("title"), str),
+                 f"{where}[{i}].title은 문자열이어야 합니다.")
+        _check_axes(item.get("axes"), f"{where}[{i}]")
+
+
+def validate(raw):
+    """추천 데이터의 구조를 검사합니다 (문제가 있으면 RecommendationSchemaError)."""
+    _require(isinstance(raw, dict), "최상위 값은 객체여야 합니다.")
+    _require(raw.get("version") == SCHEMA_VERSION,
+             f"지원하지 않는 데이터 버전입니다: {raw.get('version')!r} (필요: {SCHEMA_VERSION})")
+
+    careers = raw.get("careers")
+    _require(isinstance(careers, dict), "'careers'는 MBTI 유형별 객체여야 합니다.")
+    for mbti in MBTI_TYPES:
+        _require(mbti in careers, f"careers에 {mbti} 유형이 없습니다.")
+        _require(isinstance(careers[mbti], list), f"careers.{mbti}는 목록이어야 합니다.")
+        for i, item in enumerate(careers[mbti]):
+            where = f"careers.{mbti}[{i}]"
+            _require(isinstance(item, dict), f"{where}는 객체여야 합니다.")
+            _require(isinstance(item.get("job"), str), f"{where}.job은 문자열이어야 합니다.")
+            _require(_is_str_list(item.get("majors")), f"{where}.majors는 문자열 목록이어야 합니다.")
+            _require(isinstance(item.get("personality"), str), f"{where}.personality는 문자열이어야 합니다.")
+            _check_axes(item.get("axes"), where)
+
+    media = raw.get("media")
+    _require(isinstance(media, dict), "'media'는 MBTI 유형별 객체여야 합니다.")
+    for mbti in MBTI_TYPES:
+        _require(mbti in media, f"media에 {mbti} 유형이 없습니다.")
+        entry = media[mbti]
+        where = f"media.{mbti}"
+        _require(isinstance(entry, dict), f"{where}는 객체여야 합니다.")
+        _check_titles(entry.get("books"), f"{where}.books")
+        _check_titles(entry.get("movies"), f"{where}.movies")
+        _require(isinstance(entry.get("reason"), str), f"{where}.reason은 문자열이어야 합니다.")
+
+
+def _freeze(value):
+    """dict는 MappingProxyType, list는 tuple로 바꿔 읽기 전용으로 만듭니다."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(v) for key, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@lru_cache(maxsize=4)
+def _load(path, mtime_ns):
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    validate(raw)
+    return _freeze(raw)
+
+
+def load_store(path=RECOMMENDATIONS_JSON):
+    """검증된 읽기 전용 추천 데이터 {'version', 'careers', 'media'}."""
+    return _load(str(path), os.stat(path).st_mtime_ns)
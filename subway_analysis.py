@@ -0,0 +1,93 @@
+"""지하철 승·하차 기간/호선 집계 함수 모음.
+
+subway_data.SubwayStore.frame()이 돌려주는 (사용일자, 노선명, 역명)별 표를 받아
+기간, 평일/주말, 여러 호선 조건을 한 번의 벡터 연산 마스크로 고른 뒤
+groupby 합계로 묶어서 바로 그래프에 넣을 수 있는 표를 돌려줍니다.
+"""
+import numpy as np
+import pandas as pd
+
+DAY_TYPES = ["전체", "평일", "주말"]
+
+COUNT_COLUMNS = ["승차총승객수", "하차총승객수"]
+
+
+def to_timestamp(dates):
+    """YYYYMMDD 정수 배열을 datetime으로 바꿉니다 (고유 날짜만 변환)."""
+    unique, inverse = np.unique(np.asarray(dates), return_inverse=True)
+    converted = pd.to_datetime(unique.astype(str), format="%Y%m%d")
+    return converted[inverse]
+
+
+def select_mask(df, start=None, end=None, lines=None, day_type="전체"):
+    """기간(YYYYMMDD, 양 끝 포함), 호선 목록, 평일/주말 조건에 맞는 행 마스크."""
+    dates = df["사용일자"].to_numpy()
+    mask = np.ones(len(df), dtype=bool)
+    if start is not None:
+        mask &= dates >= start
+    if end is not None:
+        mask &= dates <= end
+    if lines:
+        line_col = df["노선명"]
+        codes = line_col.cat.categories.get_indexer(list(lines))
+        mask &= np.isin(line_col.cat.codes.to_numpy(), codes[codes >= 0])
+    if day_type != "전체":
+        weekday = to_timestamp(dates).dayofweek.to_numpy()
+        mask &= (weekday >= 5) if day_type == "주말" else (weekday < 5)
+    return mask
+
+
+def _summarize(selected, keys):
+    totals = (
+        selected.groupby(keys, observed=True, sort=False)[COUNT_COLUMNS]
+        .sum()
+        .astype("int64")
+        .reset_index()
+    )
+    totals["승하차합계"] = totals["승차총승객수"] + totals["하차총승객수"]
+    return totals
+
+
+def station_totals(df, start=None, end=None, lines=None, day_type="전체",
+                   top_n=None, merge_lines=False):
+    """조건에 맞는 기간의 역별 승·하차 합계 (승하차합계 내림차순).
+
+    merge_lines=True이면 여러 호선이 지나는 역을 역명 하나로 합칩니다.
+    top_n을 주면 상위 N개 역만 돌려줍니다.
+    """
+    selected = df[select_mask(df, start, end, lines, day_type)]
+    keys = ["역명"] if merge_lines else ["노선명", "역명"]
+    totals = _summarize(selected, keys)
+    totals = (
+        totals.nlargest(top_n, "승하차합계") if top_n
+        else totals.sort_values("승하차합계", ascending=False)
+    ).reset_index(drop=True)
+    # 여러 호선을 함께 그릴 때 x축에 쓸 이름
+    totals["표시명"] = (
+        totals["역명"].astype(str) if merge_lines
+        else totals["역명"].astype(str) + " (" + totals["노선명"].astype(str) + ")"
+    )
+    return totals
+
+
+def daily_line_totals(df, start=None, end=None, lines=None, day_type="전체"):
+    """날짜 × 호선별 승·하차 합계 (선 그래프용, 날짜 컬럼은 datetime)."""
+    selected = df[select_mask(df, start, end, lines, day_type)]
+    totals = _summarize(selected, ["사용일자", "노선명"])
+    totals = totals.sort_values(["사용일자", "노선명"], ignore_index=True)
+    totals["날짜"] = to_timestamp(totals["사용일자"].to_numpy())
+    return totals
+
+
+def line_totals(df, start=None, end=None, lines=None, day_type="전체"):
+    """호선별 기간 합계와 하루 평균 (승하차합계 내림차순)."""
+    selected = df[select_mask(df, start, end, lines, day_type)]
+    totals = _summarize(selected, ["노선명"])
+    days = (
+        selected.groupby("노선명", observed=True, sort=False)["사용일자"]
+        .nunique()
+        .reindex(totals["노선명"])
+        .to_numpy()
+    )
+    totals["일평균"] = np.round(totals["승하차합계"].to_numpy() / np.maximum(days, 1)).astype("int64")
+    return totals.sort_values("승하차합계", ascending=False, ignore_index=True)
@@ -0,0 +1,62 @@
+"""지하철 역별 막대그래프 생성 함수.
+
+역이 많은 호선도 상위 N개 역 + '기타' 막대 하나로 줄여서 그리므로
+그래프 생성 시간과 브라우저로 보내는 데이터 크기가 N에만 비례합니다.
+"""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import plotly.colors as plotly_colors
+import plotly.graph_objects as go
+
+OTHERS_COLOR = "lightgray"
+
+
+@lru_cache(maxsize=None)
+def station_bar_colors(n):
+    """1등은 빨간색, 나머지는 진한 파랑 → 옅은 파랑 그라데이션 (n개 모두 채움)."""
+    if n <= 0:
+        return ()
+    blues = plotly_colors.sample_colorscale("Blues", np.linspace(1.0, 0.3, n - 1)) if n > 1 else []
+    return ("red", *blues)
+
+
+def top_n_with_others(frame, top_n):
+    """승하차합계 내림차순 표에서 상위 top_n개 역만 남기고 나머지는 '기타'로 합칩니다."""
+    top = frame.head(top_n)
+    rest = frame.iloc[top_n:]
+    if rest.empty:
+        return top[["역명", "승하차합계"]].astype({"역명": str}), False
+    others = pd.DataFrame({
+        "역명": [f"기타 ({len(rest)}개 역)"],
+        "승하차합계": [rest["승하차합계"].sum()],
+    })
+    return pd.concat([top[["역명", "승하차합계"]].astype({"역명": str}), others], ignore_index=True), True
+
+
+def build_station_figure(frame, title, top_n):
+    """상위 top_n개 역(+ 기타) 승·하차 합계 막대그래프."""
+    plot_df, has_others = top_n_with_others(frame, top_n)
+    colors = list(station_bar_colors(len(plot_df) - has_others))
+    if has_others:
+        colors.append(OTHERS_COLOR)
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Bar(
+        x=plot_df["역명"],
+        y=plot_df["승하차합계"],
+        marker=dict(color=colors),
+        text=plot_df["승하차합계"],
+        textposition='outside'
+    ))
+
+    fig.update_layout(
+        title=title,
+        xaxis_title="역명",
+        yaxis_title="승·하차 합계",
+        template="plotly_white",
+        height=600
+    )
+    return fig
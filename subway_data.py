@@ -0,0 +1,390 @@
+"""서울 지하철 승·하차 데이터 적재(ingest) 모듈.
+
+원본 CSV(cp949)는 한 번만 파싱해서 타입이 정해진 Parquet 파일로 바꿔 두고,
+이후에는 Parquet 파일을 바로 읽어 콜드 스타트 시간과 메모리를 줄입니다.
+원본 파일마다 크기·수정 시각과 마지막으로 읽은 위치를 manifest에 적어 두므로,
+CSV가 바뀌거나 월별 파일이 추가되면 그 파일만 다시 읽습니다.
+
+여러 달치 파일은 청크 단위로 읽어 (날짜, 호선, 역)별 합계로 바로 누적하므로
+원본 전체를 메모리에 올리지 않습니다.
+
+SubwayStore는 같은 합계를 사용일자별 Parquet 파티션으로 저장합니다. 새 파일이
+들어오거나 기존 CSV 끝에 하루치 행이 덧붙으면 그 부분만 읽어 해당 날짜의
+파티션만 추가·갱신하므로, 매일 갱신하는 비용이 전체 기간이 아니라 하루치
+데이터 크기에 비례합니다. 날짜마다 내용 토큰이 있어 캐시도 바뀐 날짜에
+걸린 것만 무효화할 수 있습니다.
+"""
+import bisect
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 사이 잠금 없이 동작
+    fcntl = None
+
+SOURCE_CSV = "bongsuuun.csv"
+# 추가 월별 파일(서울 열린데이터광장 일별 승하차 CSV)을 넣어 두는 폴더
+SOURCE_DIR = Path("data") / "subway"
+CACHE_DIR = Path(".cache") / "subway"
+CHUNK_SIZE = 200_000
+
+# 덧붙은 파일인지 확인할 때 비교하는 이전 끝부분 크기
+TAIL_BYTES = 1 << 16
+
+KEY_COLUMNS = ["사용일자", "노선명", "역명"]
+COUNT_COLUMNS = ["승차총승객수", "하차총승객수"]
+
+# 청크를 읽을 때의 타입 (이름은 청크마다 범주가 달라지므로 문자열로 읽음)
+CHUNK_DTYPES = {
+    "사용일자": "int32",
+    "노선명": str,
+    "역명": str,
+    "승차총승객수": "int64",
+    "하차총승객수": "int64",
+}
+
+# 저장·사용할 때의 타입 (날짜는 YYYYMMDD 정수, 이름은 범주형, 인원 수는 int32)
+CSV_DTYPES = {
+    "사용일자": "int32",
+    "노선명": "category",
+    "역명": "category",
+    "승차총승객수": "int32",
+    "하차총승객수": "int32",
+}
+
+def source_files():
+    """기본 CSV와 SOURCE_DIR 안의 월별 CSV 경로 목록."""
+    files = [Path(SOURCE_CSV)] if Path(SOURCE_CSV).exists() else []
+    files += sorted(SOURCE_DIR.glob("*.csv"))
+    return files
+
+
+def iter_csv_chunks(paths, chunksize=CHUNK_SIZE):
+    """여러 CSV 파일을 청크 단위로 차례로 읽어 돌려주는 제너레이터."""
+    for path in paths:
+        with pd.read_csv(
+            path,
+            encoding="cp949",
+            usecols=list(CHUNK_DTYPES),
+            dtype=CHUNK_DTYPES,
+            chunksize=chunksize,
+        ) as reader:
+            yield from reader
+
+
+def iter_appended_chunks(path, offset, chunksize=CHUNK_SIZE):
+    """CSV에서 offset 바이트 뒤에 덧붙은 행만 청크 단위로 읽습니다 (머리글은 파일 첫 줄)."""
+    header = pd.read_csv(path, encoding="cp949", nrows=0).columns
+    with open(path, "rb") as f:
+        f.seek(offset)
+        try:
+            with pd.read_csv(
+                f,
+                encoding="cp949",
+                header=None,
+                names=list(header),
+                usecols=list(CHUNK_DTYPES),
+                dtype=CHUNK_DTYPES,
+                chunksize=chunksize,
+            ) as reader:
+                yield from reader
+        except pd.errors.EmptyDataError:
+            # 빈 줄만 덧붙은 경우
+            return
+
+
+def _combine(total, partials):
+    frames = ([] if total is None else [total]) + partials
+    if not frames:
+        return total
+    return pd.concat(frames).groupby(level=KEY_COLUMNS, sort=False).sum()
+
+
+def aggregate_chunks(chunks, compact_rows=CHUNK_SIZE):
+    """청크를 하나씩 받아 (날짜, 호선, 역)별 승·하차 합계로 누적합니다.
+
+    청크마다 먼저 합계를 내고, 쌓인 부분 합계가 compact_rows를 넘으면
+    전체 합계에 합쳐 두므로 메모리는 결과 크기 + 청크 하나 정도로 유지됩니다.
+    """
+    total, partials, pending = None, [], 0
+    for chunk in chunks:
+        part = chunk.groupby(KEY_COLUMNS, sort=False)[COUNT_COLUMNS].sum()
+        partials.append(part)
+        pending += len(part)
+        if pending >= compact_rows:
+            total, partials, pending = _combine(total, partials), [], 0
+    total = _combine(total, partials)
+
+    if total is None:
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in CSV_DTYPES.items()})
+    df = total.reset_index().sort_values(KEY_COLUMNS, ignore_index=True)
+    return df.astype(CSV_DTYPES)
+
+
+def concat_frames(frames):
+    """(날짜, 호선, 역)별 표 여러 개를 범주형 타입을 유지한 채 이어 붙입니다."""
+    if not frames:
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in CSV_DTYPES.items()})
+    dtypes = {
+        col: pd.CategoricalDtype(sorted(set().union(*(frame[col].cat.categories for frame in frames))))
+        for col, dtype in CSV_DTYPES.items() if dtype == "category"
+    }
+    return pd.concat([frame.astype(dtypes) for frame in frames], ignore_index=True)
+
+
+def _frame_token(frame):
+    """하루치 표의 내용 해시 (캐시 키용)."""
+    hashed = pd.util.hash_pandas_object(frame.astype({col: str for col in ["노선명", "역명"]}), index=False)
+    return hashlib.sha1(hashed.to_numpy().tobytes()).hexdigest()[:12]
+
+
+@contextmanager
+def _file_lock(path):
+    """같은 CACHE_DIR을 쓰는 다른 프로세스(워커)와 적재가 겹치지 않도록 잡는 잠금."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        f = open(path, "a")
+    except OSError:
+        # 읽기 전용 환경에서는 이 프로세스 안의 잠금만 사용
+        yield
+        return
+    with f:
+        if fcntl is not None:
+            # 파일을 닫으면 잠금도 풀림
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def _atomic_write(target, write):
+    # 다른 워커가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓰고 교체
+    tmp = target.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    write(tmp)
+    os.replace(tmp, target)
+
+
+class SubwayStore:
+    """사용일자별 Parquet 파티션으로 나눈 (날짜, 호선, 역) 승·하차 합계 저장소.
+
+    manifest.json 에 원본 파일마다 읽은 크기·수정 시각·끝부분 해시를, 날짜마다
+    어느 파일에서 왔는지와 내용 토큰을 적어 둡니다. refresh()는
+
+    - 그대로인 파일은 stat만 하고 건너뛰고,
+    - 끝에 행이 덧붙은 파일은 덧붙은 부분만 읽어 해당 날짜에 더하고,
+    - 새 파일이나 통째로 바뀐 파일은 다시 읽되, 다른 파일에서 이미 들어온
+      날짜는 건드리지 않습니다 (추가 전용, 중복 집계 방지).
+
+    원본 파일을 지워도 저장된 날짜는 남으므로, 처음부터 다시 만들려면
+    CACHE_DIR 을 지우면 됩니다. 날짜별 표는 처음 쓸 때 읽어 메모리에 두고
+    공유하므로 읽기만 해야 합니다.
+    """
+
+    def __init__(self, root=CACHE_DIR):
+        self.root = Path(root)
+        self.days_dir = self.root / "days"
+        self.manifest_path = self.root / "manifest.json"
+        self.lock_path = self.root / "manifest.lock"
+        self._lock = threading.RLock()
+        self._days = {}
+        self._manifest = self._load_manifest()
+
+    # ---- 저장 ----
+
+    def _load_manifest(self):
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            manifest = None
+        days = (manifest or {}).get("days", {})
+        if manifest is None or any(not self._day_path(int(date)).exists() for date in days):
+            # 처음 만들거나 파티션이 사라졌으면 원본부터 다시 읽음
+            return {"sources": {}, "days": {}, "lines": []}
+        manifest["days"] = {int(date): entry for date, entry in days.items()}
+        return manifest
+
+    def _save_manifest(self):
+        manifest = dict(self._manifest, days={str(date): entry for date, entry in self._manifest["days"].items()})
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            _atomic_write(self.manifest_path, lambda tmp: tmp.write_text(
+                json.dumps(manifest, ensure_ascii=False), encoding="utf-8"))
+        except OSError:
+            # 읽기 전용 환경에서는 메모리에만 유지
+            pass
+
+    def _day_path(self, date):
+        return self.days_dir / f"{date}.parquet"
+
+    def _put_day(self, date, frame, source):
+        for col in ["노선명", "역명"]:
+            frame[col] = frame[col].cat.remove_unused_categories()
+        self._days[date] = frame
+        self._manifest["days"][date] = {"source": source, "token": _frame_token(frame)}
+        try:
+            self.days_dir.mkdir(parents=True, exist_ok=True)
+            _atomic_write(self._day_path(date), lambda tmp: frame.to_parquet(tmp, index=False))
+        except OSError:
+            pass
+
+    # ---- 적재 ----
+
+    def refresh(self, paths=None):
+        """원본 파일에서 새로 들어온 행만 읽어 저장소를 갱신하고, 바뀐 날짜 목록을 돌려줍니다.
+
+        원본이 그대로면 stat만 하고 끝납니다. 바뀌었으면 파일 잠금을 잡고 다른
+        워커가 먼저 적재했을 수 있는 manifest를 다시 읽은 뒤 남은 부분만 적재하므로,
+        여러 프로세스가 같은 CACHE_DIR을 써도 덧붙은 행을 두 번 더하지 않습니다.
+        돌려주는 날짜에는 다른 워커가 바꾼 날짜도 들어갑니다.
+        """
+        paths = [Path(path) for path in (source_files() if paths is None else paths)]
+        with self._lock:
+            if all(self._unchanged(path) for path in paths):
+                return []
+            with _file_lock(self.lock_path):
+                before = {date: entry["token"] for date, entry in self._manifest["days"].items()}
+                if self.manifest_path.exists():
+                    self._manifest = self._load_manifest()
+                ingested = set()
+                for path in paths:
+                    ingested |= self._ingest(path)
+                changed = {
+                    date for date, entry in self._manifest["days"].items()
+                    if before.get(date) != entry["token"]
+                }
+                # 다른 워커가 바꾼 날짜는 메모리에 둔 예전 표를 버리고 다시 읽음
+                for date in changed - ingested:
+                    self._days.pop(date, None)
+                if ingested:
+                    lines = set(self._manifest["lines"])
+                    for date in ingested:
+                        lines.update(self._days[date]["노선명"].cat.categories)
+                    self._manifest["lines"] = sorted(lines)
+                    self._save_manifest()
+        return sorted(changed)
+
+    def _unchanged(self, path):
+        seen = self._manifest["sources"].get(path.as_posix())
+        stat = os.stat(path)
+        return bool(seen) and seen["size"] == stat.st_size and seen["mtime_ns"] == stat.st_mtime_ns
+
+    def _ingest(self, path):
+        if self._unchanged(path):
+            return set()
+        name = path.as_posix()
+        stat = os.stat(path)
+        seen = self._manifest["sources"].get(name)
+
+        appended = (
+            bool(seen) and seen["tail"] is not None and stat.st_size > seen["size"]
+            and self._tail_digest(path, seen["size"]) == seen["tail"]
+        )
+        chunks = iter_appended_chunks(path, seen["size"]) if appended else iter_csv_chunks([path])
+        new = aggregate_chunks(chunks)
+
+        changed = set()
+        for date, part in new.groupby("사용일자", sort=True):
+            date = int(date)
+            entry = self._manifest["days"].get(date)
+            if entry is not None and entry["source"] != name:
+                continue
+            if entry is not None and appended:
+                # 같은 날짜의 행이 이어서 덧붙은 경우: 기존 합계에 더함
+                merged = concat_frames([self.day(date), part]).astype({"노선명": str, "역명": str})
+                part = aggregate_chunks([merged])
+            self._put_day(date, part.reset_index(drop=True), name)
+            changed.add(date)
+
+        self._manifest["sources"][name] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "tail": self._tail_digest(path, stat.st_size),
+        }
+        return changed
+
+    @staticmethod
+    def _tail_digest(path, size):
+        """파일 앞 size 바이트 중 끝부분 해시 (줄 끝으로 끝나지 않으면 None)."""
+        with open(path, "rb") as f:
+            f.seek(max(0, size - TAIL_BYTES))
+            tail = f.read(size - max(0, size - TAIL_BYTES))
+        if not tail.endswith(b"\n"):
+            return None
+        return hashlib.sha1(tail).hexdigest()
+
+    # ---- 조회 ----
+
+    def dates(self):
+        """저장된 사용일자(YYYYMMDD) 목록 (오름차순)."""
+        return sorted(self._manifest["days"])
+
+    def lines(self):
+        """저장된 모든 노선명 (가나다순)."""
+        return list(self._manifest["lines"])
+
+    def token(self, date):
+        """그 날짜 데이터의 내용 토큰 (데이터가 바뀌면 달라짐)."""
+        entry = self._manifest["days"].get(date)
+        return entry and entry["token"]
+
+    def range_token(self, start=None, end=None):
+        """기간 안 날짜들의 토큰을 합친 것: 기간 밖 날짜가 추가돼도 그대로입니다."""
+        digest = hashlib.sha1()
+        for date in self._select(start, end):
+            digest.update(f"{date}:{self.token(date)};".encode())
+        return digest.hexdigest()[:16]
+
+    def _select(self, start, end):
+        dates = self.dates()
+        lo = 0 if start is None else bisect.bisect_left(dates, start)
+        hi = len(dates) if end is None else bisect.bisect_right(dates, end)
+        return dates[lo:hi]
+
+    def day(self, date):
+        """하루치 (호선, 역)별 합계 표."""
+        with self._lock:
+            if date not in self._days:
+                self._days[date] = pd.read_parquet(self._day_path(date))
+            return self._days[date]
+
+    def frame(self, start=None, end=None):
+        """기간(YYYYMMDD, 양 끝 포함) 안 날짜들을 이어 붙인 표."""
+        return concat_frames([self.day(date) for date in self._select(start, end)])
+
+
+def group_by_month(dates):
+    """월(YYYYMM) → 그 달의 날짜(YYYYMMDD) 목록 (오름차순)."""
+    months = {}
+    for date in sorted(int(date) for date in dates):
+        months.setdefault(date // 100, []).append(date)
+    return months
+
+
+def build_station_index(df):
+    """(사용일자, 노선명) → 승하차합계 내림차순으로 정렬된 역별 표 딕셔너리.
+
+    데이터 버전마다 한 번만 만들어 두면, 선택이 바뀔 때마다 전체 표를
+    필터링·정렬하지 않고 바로 꺼내 쓸 수 있습니다. 반환된 표는 공유되므로
+    수정하지 말고 읽기만 해야 합니다.
+    """
+    totals = (
+        df.groupby(["사용일자", "노선명", "역명"], observed=True, sort=False)[
+            ["승차총승객수", "하차총승객수"]
+        ]
+        .sum()
+        .reset_index()
+    )
+    totals["승하차합계"] = totals["승차총승객수"] + totals["하차총승객수"]
+    totals = totals.sort_values(
+        ["사용일자", "노선명", "승하차합계"], ascending=[True, True, False], kind="stable"
+    )
+
+    index = {}
+    for (date, line), group in totals.groupby(["사용일자", "노선명"], observed=True, sort=False):
+        index[(int(date), line)] = group.reset_index(drop=True)
+    return index
@@ -0,0 +1,93 @@
+"""지하철 역별 승·하차 인원을 격자 칸으로 묶어 Folium 히트맵으로 그리는 함수 모음.
+
+역 좌표는 저장소에 들어 있는 data/seoul_stations.csv (core.geo, 오프라인)를 쓰고, 역마다
+어느 격자 칸에 속하는지는 한 번만 계산해 둡니다. 날짜별로는 역 합계를 칸 번호로
+더하기만 하므로, 역이 수백 개여도 지도에는 HeatMap 레이어 하나만 올라갑니다.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from core import lazy_import
+from core.geo import STATIONS_CSV, GridIndex, load_stations
+
+# 지도는 히트맵 탭을 열 때만 필요하므로 처음 쓸 때 불러옵니다.
+folium = lazy_import("folium")
+folium_plugins = lazy_import("folium.plugins")
+
+# 지도 중심 (서울시청 부근)
+MAP_CENTER = [37.5665, 126.9780]
+
+# 격자 한 칸의 크기 (km): 역 사이 간격(약 1km)보다 조금 작게
+HEAT_CELL_KM = 0.5
+
+# 히트맵 가중치로 쓸 인원 → 더할 열
+HEAT_METRICS = {
+    "승하차합계": ["승차총승객수", "하차총승객수"],
+    "승차": ["승차총승객수"],
+    "하차": ["하차총승객수"],
+}
+
+
+class StationGrid:
+    """역 좌표를 cell_km 크기의 격자 칸에 미리 배정해 둔 표.
+
+    역은 (역명, 호선)으로 먼저 찾고, 없으면 같은 이름의 다른 호선 좌표를 씁니다
+    (환승역은 호선이 달라도 위치가 거의 같으므로).
+    """
+
+    def __init__(self, stations, cell_km=HEAT_CELL_KM):
+        # 투영과 칸 나누기는 역 근접 검색에 쓰는 GridIndex와 같은 것을 씀
+        self.index = GridIndex(stations[["위도", "경도"]].to_numpy(), cell_km)
+        self.cell_km = cell_km
+        keys, inverse = np.unique(self.index.cell_of(self.index.coords), axis=0, return_inverse=True)
+        # 역 번호 → 칸 번호, 칸 번호 → 칸 중심 (위도, 경도)
+        self.station_cell = inverse.reshape(-1)
+        self.centers = self.index.cell_center(keys)
+
+        self._by_pair = {pair: i for i, pair in enumerate(zip(stations["역명"], stations["호선"]))}
+        self._by_name = {}
+        for i, name in enumerate(stations["역명"]):
+            self._by_name.setdefault(name, i)
+
+    def lookup(self, names, lines):
+        """(역명, 노선명) 목록 → 역 번호 배열 (좌표가 없으면 -1)."""
+        return np.array(
+            [self._by_pair.get(pair, self._by_name.get(pair[0], -1)) for pair in zip(names, lines)],
+            dtype=np.int64,
+        )
+
+    def bin(self, frame, metric="승하차합계"):
+        """하루치 역별 표 → (칸별 인원 합계 배열, 좌표가 없는 역 이름 목록)."""
+        names = frame["역명"].astype(str).to_numpy()
+        station = self.lookup(names, frame["노선명"].astype(str).to_numpy())
+        found = station >= 0
+        weights = frame[HEAT_METRICS[metric]].to_numpy(dtype=np.int64).sum(axis=1)
+        totals = np.bincount(
+            self.station_cell[station[found]], weights=weights[found], minlength=len(self.centers)
+        )
+        return totals, sorted(set(names[~found]))
+
+    def heat_points(self, frame, metric="승하차합계"):
+        """HeatMap에 넣을 [위도, 경도, 가중치(0~1)] 목록과 가장 붐빈 칸의 인원, 좌표가 없는 역 목록."""
+        totals, missing = self.bin(frame, metric)
+        cells = np.flatnonzero(totals)
+        peak = totals.max() if len(cells) else 0.0
+        points = np.column_stack([
+            self.centers[cells].round(5),
+            (totals[cells] / peak).round(4) if peak else totals[cells],
+        ])
+        return points.tolist(), int(peak), missing
+
+
+@lru_cache(maxsize=None)
+def station_grid(path=STATIONS_CSV, cell_km=HEAT_CELL_KM):
+    """역 좌표 파일마다 한 번만 만드는 StationGrid."""
+    return StationGrid(load_stations(path), cell_km)
+
+
+def create_heatmap(points):
+    """격자 칸별 가중치를 HeatMap 레이어 하나로 그린 Folium 지도."""
+    m = folium.Map(location=MAP_CENTER, zoom_start=11, tiles="cartodbpositron")
+    folium_plugins.HeatMap(points, radius=18, blur=15, min_opacity=0.3, max_zoom=13).add_to(m)
+    return m
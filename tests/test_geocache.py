@@ -0,0 +1,117 @@
+"""GeocodeJob / GeocodeJobs를 오프라인 스텁(GazetteerGeocoder)으로 돌려 보는 테스트."""
+import sqlite3
+import time
+
+from geopy.exc import GeocoderServiceError
+
+from gazetteer import GazetteerGeocoder, Point
+from geocache import NOT_FOUND, GeocodeCache, GeocodeJob, GeocodeJobs, MemoryCache
+
+# 행정구역 사전에 없어서 스텁이 찾지 못하는 주소
+UNKNOWN = [f"없는도 없는구{i}" for i in range(5)]
+
+
+def wait(job, timeout=10):
+    deadline = time.monotonic() + timeout
+    while job.running:
+        assert time.monotonic() < deadline, "작업이 끝나지 않음"
+        time.sleep(0.01)
+    return job
+
+
+class CountingGeocoder:
+    """호출된 주소를 기록하고 항상 같은 좌표를 돌려주는 지오코더."""
+
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+
+    def __call__(self, address):
+        self.calls.append(address)
+        if address in self.fail:
+            self.fail.discard(address)
+            raise GeocoderServiceError("일시적인 오류")
+        return Point(37.5, 127.0)
+
+
+def test_stub_results_do_not_hide_addresses_from_real_geocoder(tmp_path):
+    db = tmp_path / "geocode.sqlite3"
+    stub_job = wait(GeocodeJob(UNKNOWN, GazetteerGeocoder(), GeocodeCache(db, geocoder="stub")).start())
+    assert stub_job.results() == {address: NOT_FOUND for address in UNKNOWN}
+
+    real = CountingGeocoder()
+    real_job = wait(GeocodeJob(UNKNOWN, real, GeocodeCache(db)).start())
+    assert real.calls == UNKNOWN
+    assert real_job.results() == {address: (37.5, 127.0) for address in UNKNOWN}
+
+    # 두 번째 실행은 실제 지오코더 캐시에서 바로 찾음
+    again = CountingGeocoder()
+    wait(GeocodeJob(UNKNOWN, again, GeocodeCache(db)).start())
+    assert again.calls == []
+
+
+def test_job_without_cache_stays_in_memory():
+    job = wait(GeocodeJob(UNKNOWN, GazetteerGeocoder()).start())
+    assert isinstance(job.cache, MemoryCache)
+    assert job.cache.get_many(UNKNOWN) == {address: NOT_FOUND for address in UNKNOWN}
+
+
+def test_cancelled_job_is_kept_until_restart():
+    addresses = [f"없는도 없는구{i}" for i in range(100)]
+    cache = MemoryCache()
+    jobs = GeocodeJobs()
+    started = []
+
+    def make_job():
+        started.append(GeocodeJob(addresses, GazetteerGeocoder(delay=0.01), cache))
+        return started[-1]
+
+    job = jobs.start("key", make_job)
+    job.cancel()
+    wait(job)
+    assert job.cancelled and job.incomplete
+
+    # 다시 실행해도 취소된 작업을 그대로 돌려줌 (새로 시작하지 않음)
+    assert jobs.start("key", make_job) is job
+    assert jobs.get("key") is job
+    assert len(started) == 1
+
+    # 사용자가 다시 시작하면 캐시에 없는 나머지만 조회
+    restarted = wait(jobs.start("key", make_job, restart=True))
+    assert restarted is not job and len(started) == 2
+    assert restarted.finished == restarted.total and not restarted.incomplete
+
+
+def test_failed_addresses_are_retried_on_restart():
+    cache = MemoryCache()
+    geocoder = CountingGeocoder(fail=[UNKNOWN[0]])
+    jobs = GeocodeJobs()
+
+    def make_job():
+        return GeocodeJob(UNKNOWN, geocoder, cache)
+
+    job = wait(jobs.start("key", make_job))
+    assert job.failed == [UNKNOWN[0]]
+    assert UNKNOWN[0] not in job.results()
+    assert jobs.start("key", make_job) is job
+
+    retried = wait(jobs.start("key", make_job, restart=True))
+    assert retried.failed == []
+    assert retried.results()[UNKNOWN[0]] == (37.5, 127.0)
+    # 이미 찾은 주소는 캐시에서 가져오므로 실패한 주소만 다시 조회
+    assert geocoder.calls == UNKNOWN + [UNKNOWN[0]]
+
+
+class LockedCache(MemoryCache):
+    """쓰기가 항상 SQLite 잠금 시간 초과로 실패하는 캐시."""
+
+    def put_many(self, results):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_cache_write_errors_are_recorded_as_failed():
+    job = wait(GeocodeJob(UNKNOWN, CountingGeocoder(), LockedCache()).start())
+    assert not job.cancelled
+    assert job.finished == job.total
+    assert job.failed == UNKNOWN
+    assert job.incomplete
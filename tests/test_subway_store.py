@@ -0,0 +1,68 @@
+"""SubwayStore 증분 적재 테스트 (작은 합성 CSV 사용)."""
+import pandas as pd
+
+from subway_data import SubwayStore
+
+COLUMNS = ["사용일자", "노선명", "역명", "승차총승객수", "하차총승객수"]
+
+
+def rows(dates, stations=("서울역", "시청", "종각")):
+    return pd.DataFrame(
+        [(date, "1호선", name, 100 + i, 50 + i) for date in dates for i, name in enumerate(stations)],
+        columns=COLUMNS,
+    )
+
+
+def write(path, frame, append=False):
+    frame.to_csv(path, mode="a" if append else "w", header=not append, index=False, encoding="cp949")
+
+
+def total(store, date):
+    return int(store.day(date)[["승차총승객수", "하차총승객수"]].to_numpy().sum())
+
+
+def test_appended_rows_are_added_once(tmp_path):
+    src = tmp_path / "subway.csv"
+    write(src, rows([20251001, 20251002]))
+    store = SubwayStore(tmp_path / "store")
+    assert store.refresh([src]) == [20251001, 20251002]
+    assert store.refresh([src]) == []
+
+    # 새 날짜 + 이미 있는 날짜에 덧붙은 행
+    write(src, pd.concat([rows([20251003]), rows([20251002], stations=("을지로입구",))]), append=True)
+    assert store.refresh([src]) == [20251002, 20251003]
+    assert total(store, 20251002) == 456 + 150
+    assert store.lines() == ["1호선"]
+
+
+def test_range_token_ignores_dates_outside_range(tmp_path):
+    src = tmp_path / "subway.csv"
+    write(src, rows([20251001, 20251002]))
+    store = SubwayStore(tmp_path / "store")
+    store.refresh([src])
+    before = store.range_token(20251001, 20251002)
+
+    write(src, rows([20251003]), append=True)
+    store.refresh([src])
+    assert store.range_token(20251001, 20251002) == before
+    assert store.range_token() != before
+
+
+def test_two_stores_on_one_root_do_not_double_count(tmp_path):
+    src = tmp_path / "subway.csv"
+    write(src, rows([20251001]))
+    first = SubwayStore(tmp_path / "store")
+    first.refresh([src])
+    # 다른 워커: 디스크의 manifest로 시작하고 날짜 표는 아직 읽지 않음
+    second = SubwayStore(tmp_path / "store")
+    assert second.refresh([src]) == []
+
+    write(src, rows([20251001], stations=("을지로입구",)), append=True)
+    assert first.refresh([src]) == [20251001]
+    # 두 번째 워커는 다시 읽지 않고 첫 번째 워커가 바꾼 날짜만 알려 줌
+    assert second.refresh([src]) == [20251001]
+
+    expected = 456 + 150
+    assert total(first, 20251001) == expected
+    assert total(second, 20251001) == expected
+    assert total(SubwayStore(tmp_path / "store"), 20251001) == expected